@@ -1,4 +1,6 @@
 from pathlib import Path
+import asyncio
+import tempfile
 import zipfile
 import io
 import logging
@@ -338,7 +340,7 @@ async def rescan_archive(archive_id: int, db: AsyncSession = Depends(get_db)):
 
     # Parse the 3MF file
     parser = ThreeMFParser(file_path)
-    metadata = parser.parse()
+    metadata = await asyncio.to_thread(parser.parse)
 
     # Update fields from metadata
     if metadata.get("filament_type"):
@@ -423,7 +425,7 @@ async def rescan_all_archives(db: AsyncSession = Depends(get_db)):
                 continue
 
             parser = ThreeMFParser(file_path)
-            metadata = parser.parse()
+            metadata = await asyncio.to_thread(parser.parse)
 
             if metadata.get("filament_type"):
                 archive.filament_type = metadata["filament_type"]
@@ -609,8 +611,7 @@ async def scan_timelapse(
         raise HTTPException(400, "Archive has no associated printer")
 
     # Get printer
-    result = await db.execute(select(Printer).where(Printer.id == archive.printer_id))
-    printer = result.scalar_one_or_none()
+    printer = await db.get(Printer, archive.printer_id)
     if not printer:
         raise HTTPException(404, "Printer not found")
 
@@ -807,10 +808,7 @@ async def select_timelapse(
     if not archive.printer_id:
         raise HTTPException(400, "Archive has no associated printer")
 
-    result = await db.execute(
-        select(Printer).where(Printer.id == archive.printer_id)
-    )
-    printer = result.scalar_one_or_none()
+    printer = await db.get(Printer, archive.printer_id)
     if not printer:
         raise HTTPException(404, "Printer not found")
 
@@ -909,7 +907,7 @@ async def upload_photo(
 
     # Save file
     content = await file.read()
-    photo_path.write_bytes(content)
+    await asyncio.to_thread(photo_path.write_bytes, content)
 
     # Update archive photos list (create new list to trigger SQLAlchemy change detection)
     photos = list(archive.photos or [])
@@ -1170,13 +1168,15 @@ async def upload_archive(
     if not file.filename or not file.filename.endswith(".3mf"):
         raise HTTPException(400, "File must be a .3mf file")
 
-    # Save uploaded file temporarily
-    temp_path = settings.archive_dir / "temp" / file.filename
-    temp_path.parent.mkdir(parents=True, exist_ok=True)
+    # Save uploaded file temporarily, in a private directory so concurrent
+    # uploads of the same filename can't overwrite or delete each other's file
+    temp_root = settings.archive_dir / "temp"
+    await asyncio.to_thread(temp_root.mkdir, parents=True, exist_ok=True)
 
-    try:
+    with tempfile.TemporaryDirectory(dir=temp_root) as temp_dir:
+        temp_path = Path(temp_dir) / file.filename
         content = await file.read()
-        temp_path.write_bytes(content)
+        await asyncio.to_thread(temp_path.write_bytes, content)
 
         service = ArchiveService(db)
         archive = await service.archive_print(
@@ -1188,9 +1188,6 @@ async def upload_archive(
             raise HTTPException(400, "Failed to archive file")
 
         return ArchiveResponse.model_validate(archive)
-    finally:
-        if temp_path.exists():
-            temp_path.unlink()
 
 
 @router.post("/upload-bulk")
@@ -1203,23 +1200,25 @@ async def upload_archives_bulk(
     results = []
     errors = []
 
+    temp_root = settings.archive_dir / "temp"
+    await asyncio.to_thread(temp_root.mkdir, parents=True, exist_ok=True)
+
     for file in files:
         if not file.filename or not file.filename.endswith(".3mf"):
             errors.append({"filename": file.filename or "unknown", "error": "Not a .3mf file"})
             continue
 
-        temp_path = settings.archive_dir / "temp" / file.filename
-        temp_path.parent.mkdir(parents=True, exist_ok=True)
-
         try:
-            content = await file.read()
-            temp_path.write_bytes(content)
-
-            service = ArchiveService(db)
-            archive = await service.archive_print(
-                printer_id=printer_id,
-                source_file=temp_path,
-            )
+            with tempfile.TemporaryDirectory(dir=temp_root) as temp_dir:
+                temp_path = Path(temp_dir) / file.filename
+                content = await file.read()
+                await asyncio.to_thread(temp_path.write_bytes, content)
+
+                service = ArchiveService(db)
+                archive = await service.archive_print(
+                    printer_id=printer_id,
+                    source_file=temp_path,
+                )
 
             if archive:
                 results.append({
@@ -1231,9 +1230,6 @@ async def upload_archives_bulk(
                 errors.append({"filename": file.filename, "error": "Failed to process"})
         except Exception as e:
             errors.append({"filename": file.filename, "error": str(e)})
-        finally:
-            if temp_path.exists():
-                temp_path.unlink()
 
     return {
         "uploaded": len(results),
@@ -1262,8 +1258,7 @@ async def reprint_archive(
         raise HTTPException(404, "Archive not found")
 
     # Get printer
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
+    printer = await db.get(Printer, printer_id)
     if not printer:
         raise HTTPException(404, "Printer not found")
 
@@ -1327,7 +1322,7 @@ async def get_project_page(archive_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(404, "Archive file not found")
 
     parser = ProjectPageParser(file_path)
-    data = parser.parse(archive_id)
+    data = await asyncio.to_thread(parser.parse, archive_id)
 
     return ProjectPageResponse(**data)
 
@@ -1351,13 +1346,13 @@ async def update_project_page(
         raise HTTPException(404, "Archive file not found")
 
     parser = ProjectPageParser(file_path)
-    success = parser.update_metadata(update_data)
+    success = await asyncio.to_thread(parser.update_metadata, update_data)
 
     if not success:
         raise HTTPException(500, "Failed to update project page")
 
     # Return updated data
-    data = parser.parse(archive_id)
+    data = await asyncio.to_thread(parser.parse, archive_id)
     return data
 
 
@@ -1380,7 +1375,7 @@ async def get_project_image(
         raise HTTPException(404, "Archive file not found")
 
     parser = ProjectPageParser(file_path)
-    result = parser.get_image(image_path)
+    result = await asyncio.to_thread(parser.get_image, image_path)
 
     if not result:
         raise HTTPException(404, "Image not found in 3MF file")
@@ -1431,7 +1426,7 @@ async def upload_source_3mf(
     source_path = source_dir / source_filename
 
     content = await file.read()
-    source_path.write_bytes(content)
+    await asyncio.to_thread(source_path.write_bytes, content)
 
     # Update archive with source path (relative to base_dir)
     archive.source_3mf_path = str(source_path.relative_to(settings.base_dir))
@@ -1575,7 +1570,7 @@ async def upload_source_3mf_by_name(
     source_path = source_dir / source_filename
 
     content = await file.read()
-    source_path.write_bytes(content)
+    await asyncio.to_thread(source_path.write_bytes, content)
 
     # Update archive with source path
     archive.source_3mf_path = str(source_path.relative_to(settings.base_dir))
@@ -5,7 +5,6 @@ import logging
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from backend.app.core.database import get_db
 from backend.app.models.printer import Printer
@@ -35,8 +34,7 @@ async def get_kprofiles(
         nozzle_diameter: Filter by nozzle diameter (default: "0.4")
     """
     # Check printer exists
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
+    printer = await db.get(Printer, printer_id)
     if not printer:
         raise HTTPException(404, "Printer not found")
 
@@ -95,8 +93,7 @@ async def set_kprofile(
     )
 
     # Check printer exists
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
+    printer = await db.get(Printer, printer_id)
     if not printer:
         raise HTTPException(404, "Printer not found")
 
@@ -183,8 +180,7 @@ async def delete_kprofile(
         profile: K-profile identification data for deletion
     """
     # Check printer exists
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
+    printer = await db.get(Printer, printer_id)
     if not printer:
         raise HTTPException(404, "Printer not found")
 
@@ -200,10 +200,7 @@ async def _get_printer_maintenance_internal(
     await ensure_default_types(db)
 
     # Get printer
-    result = await db.execute(
-        select(Printer).where(Printer.id == printer_id)
-    )
-    printer = result.scalar_one_or_none()
+    printer = await db.get(Printer, printer_id)
     if not printer:
         raise HTTPException(status_code=404, detail="Printer not found")
 
@@ -365,10 +362,7 @@ async def perform_maintenance(
         raise HTTPException(status_code=404, detail="Maintenance item not found")
 
     # Get printer for name
-    result = await db.execute(
-        select(Printer).where(Printer.id == item.printer_id)
-    )
-    printer = result.scalar_one()
+    printer = await db.get(Printer, item.printer_id)
 
     # Get current hours
     current_hours = await get_printer_total_hours(db, item.printer_id)
@@ -465,10 +459,7 @@ async def set_printer_hours(
 ):
     """Set the total print hours for a printer (adjusts offset to match)."""
     # Get printer
-    result = await db.execute(
-        select(Printer).where(Printer.id == printer_id)
-    )
-    printer = result.scalar_one_or_none()
+    printer = await db.get(Printer, printer_id)
     if not printer:
         raise HTTPException(status_code=404, detail="Printer not found")
 
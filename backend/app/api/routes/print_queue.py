@@ -65,8 +65,7 @@ async def add_to_queue(
 ):
     """Add an item to the print queue."""
     # Validate printer exists
-    result = await db.execute(select(Printer).where(Printer.id == data.printer_id))
-    if not result.scalar_one_or_none():
+    if not await db.get(Printer, data.printer_id):
         raise HTTPException(400, "Printer not found")
 
     # Validate archive exists
@@ -137,10 +136,7 @@ async def update_queue_item(
 
     # Validate new printer_id if being changed
     if "printer_id" in update_data:
-        result = await db.execute(
-            select(Printer).where(Printer.id == update_data["printer_id"])
-        )
-        if not result.scalar_one_or_none():
+        if not await db.get(Printer, update_data["printer_id"]):
             raise HTTPException(400, "Printer not found")
 
     for field, value in update_data.items():
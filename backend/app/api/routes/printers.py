@@ -1,14 +1,19 @@
-import io
+import asyncio
+import hashlib
 import logging
+import os
+import time
 import zipfile
 from pathlib import Path
+from types import MappingProxyType
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 logger = logging.getLogger(__name__)
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
 
 from backend.app.core.database import get_db
 from backend.app.core.config import settings
@@ -18,25 +23,36 @@ from backend.app.schemas.printer import (
     PrinterUpdate,
     PrinterResponse,
     PrinterStatus,
-    HMSErrorResponse,
 )
-from backend.app.services.printer_manager import printer_manager
+from backend.app.services.printer_manager import printer_manager, printer_state_to_dict
 from backend.app.services.bambu_ftp import (
-    download_file_try_paths_async,
+    read_zip_try_paths_async,
     list_files_async,
     delete_file_async,
-    download_file_bytes_async,
+    open_file_stream_async,
     get_storage_info_async,
 )
 
 
 router = APIRouter(prefix="/printers", tags=["printers"])
 
+# Statements built once at import; per-request values are passed as bound parameters
+_STMT_PRINTERS_ORDERED = select(Printer).order_by(Printer.name)
+_STMT_PRINTER_BY_SERIAL = select(Printer).where(Printer.serial_number == bindparam("serial"))
+
+
+async def get_printer_or_404(printer_id: int, db: AsyncSession = Depends(get_db)) -> Printer:
+    """Resolve the printer_id path parameter to a Printer or raise 404."""
+    printer = await db.get(Printer, printer_id)
+    if not printer:
+        raise HTTPException(404, "Printer not found")
+    return printer
+
 
 @router.get("/", response_model=list[PrinterResponse])
 async def list_printers(db: AsyncSession = Depends(get_db)):
     """List all configured printers."""
-    result = await db.execute(select(Printer).order_by(Printer.name))
+    result = await db.execute(_STMT_PRINTERS_ORDERED)
     return list(result.scalars().all())
 
 
@@ -48,7 +64,7 @@ async def create_printer(
     """Add a new printer."""
     # Check if serial number already exists
     result = await db.execute(
-        select(Printer).where(Printer.serial_number == printer_data.serial_number)
+        _STMT_PRINTER_BY_SERIAL, {"serial": printer_data.serial_number}
     )
     if result.scalar_one_or_none():
         raise HTTPException(400, "Printer with this serial number already exists")
@@ -66,27 +82,18 @@ async def create_printer(
 
 
 @router.get("/{printer_id}", response_model=PrinterResponse)
-async def get_printer(printer_id: int, db: AsyncSession = Depends(get_db)):
+async def get_printer(printer: Printer = Depends(get_printer_or_404)):
     """Get a specific printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
     return printer
 
 
 @router.patch("/{printer_id}", response_model=PrinterResponse)
 async def update_printer(
-    printer_id: int,
     printer_data: PrinterUpdate,
+    printer: Printer = Depends(get_printer_or_404),
     db: AsyncSession = Depends(get_db),
 ):
     """Update a printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
     update_data = printer_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(printer, field, value)
@@ -96,7 +103,7 @@ async def update_printer(
 
     # Reconnect if connection settings changed
     if any(k in update_data for k in ["ip_address", "access_code", "is_active"]):
-        printer_manager.disconnect_printer(printer_id)
+        printer_manager.disconnect_printer(printer.id)
         if printer.is_active:
             await printer_manager.connect_printer(printer)
 
@@ -104,86 +111,51 @@ async def update_printer(
 
 
 @router.delete("/{printer_id}")
-async def delete_printer(printer_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_printer(
+    printer: Printer = Depends(get_printer_or_404),
+    db: AsyncSession = Depends(get_db),
+):
     """Delete a printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
-    printer_manager.disconnect_printer(printer_id)
+    printer_id = printer.id
     await db.delete(printer)
     await db.commit()
 
+    printer_manager.disconnect_printer(printer_id)
+
     return {"status": "deleted"}
 
 
 @router.get("/{printer_id}/status", response_model=PrinterStatus)
-async def get_printer_status(printer_id: int, db: AsyncSession = Depends(get_db)):
+async def get_printer_status(printer: Printer = Depends(get_printer_or_404)):
     """Get real-time status of a printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
-    state = printer_manager.get_status(printer_id)
+    state = printer_manager.get_status(printer.id)
     if not state:
         return PrinterStatus(
-            id=printer_id,
+            id=printer.id,
             name=printer.name,
             connected=False,
         )
 
-    # Determine cover URL if there's an active print
-    cover_url = None
-    if state.state == "RUNNING" and state.gcode_file:
-        cover_url = f"/api/v1/printers/{printer_id}/cover"
-
-    # Convert HMS errors to response format
-    hms_errors = [
-        HMSErrorResponse(code=e.code, module=e.module, severity=e.severity)
-        for e in (state.hms_errors or [])
-    ]
-
+    # Same payload as the WebSocket status broadcast; nested HMS errors are
+    # validated as plain dicts in one pass instead of one model per error
     return PrinterStatus(
-        id=printer_id,
+        id=printer.id,
         name=printer.name,
-        connected=state.connected,
-        state=state.state,
-        current_print=state.current_print,
-        subtask_name=state.subtask_name,
-        gcode_file=state.gcode_file,
-        progress=state.progress,
-        remaining_time=state.remaining_time,
-        layer_num=state.layer_num,
-        total_layers=state.total_layers,
-        temperatures=state.temperatures,
-        cover_url=cover_url,
-        hms_errors=hms_errors,
+        **printer_state_to_dict(state, printer.id),
     )
 
 
 @router.post("/{printer_id}/connect")
-async def connect_printer(printer_id: int, db: AsyncSession = Depends(get_db)):
+async def connect_printer(printer: Printer = Depends(get_printer_or_404)):
     """Manually connect to a printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
     success = await printer_manager.connect_printer(printer)
     return {"connected": success}
 
 
 @router.post("/{printer_id}/disconnect")
-async def disconnect_printer(printer_id: int, db: AsyncSession = Depends(get_db)):
+async def disconnect_printer(printer: Printer = Depends(get_printer_or_404)):
     """Manually disconnect from a printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
-    printer_manager.disconnect_printer(printer_id)
+    printer_manager.disconnect_printer(printer.id)
     return {"connected": False}
 
 
@@ -202,43 +174,105 @@ async def test_printer_connection(
     return result
 
 
-# Cache for cover images (printer_id -> (gcode_file, image_bytes))
-_cover_cache: dict[int, tuple[str, bytes]] = {}
+# Common thumbnail paths in 3MF files, in order of preference
+_THUMBNAIL_PATHS = (
+    "Metadata/plate_1.png",
+    "Metadata/thumbnail.png",
+    "Metadata/plate_1_small.png",
+    "Thumbnails/thumbnail.png",
+    "thumbnail.png",
+)
 
+# Cover downloads in progress, shared by concurrent requests for the same job
+_cover_inflight: dict[tuple[int, str], asyncio.Task[bytes]] = {}
 
-@router.get("/{printer_id}/cover")
-async def get_printer_cover(printer_id: int, db: AsyncSession = Depends(get_db)):
-    """Get the cover image for the current print job."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
+# Bounds for the on-disk cover cache; files past either limit are swept
+_COVER_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+_COVER_CACHE_MAX_FILES = 256
 
-    state = printer_manager.get_status(printer_id)
-    if not state:
-        raise HTTPException(404, "Printer not connected")
 
-    # Use subtask_name as the 3MF filename (gcode_file is the path inside the 3MF)
-    subtask_name = state.subtask_name
-    if not subtask_name:
-        raise HTTPException(404, f"No subtask_name in printer state (state={state.state})")
+def _cover_key(serial_number: str, subtask_name: str) -> str:
+    """Stable identifier for a job's cover, used for the cache file name and ETag."""
+    return hashlib.blake2b(f"{serial_number}:{subtask_name}".encode(), digest_size=16).hexdigest()
 
-    # Check cache
-    if printer_id in _cover_cache:
-        cached_file, cached_image = _cover_cache[printer_id]
-        if cached_file == subtask_name:
-            return Response(content=cached_image, media_type="image/png")
 
+def _cover_cache_path(cover_key: str) -> Path:
+    """Location of the cached cover for a job, shared by all workers and kept across restarts."""
+    return settings.archive_dir / "covers" / f"{cover_key}.png"
+
+
+def prune_cover_cache() -> None:
+    """Delete cached covers older than the max age, then the oldest ones over the count limit."""
+    cache_dir = settings.archive_dir / "covers"
+    if not cache_dir.is_dir():
+        return
+
+    files = []
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            try:
+                files.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+
+    files.sort(reverse=True)
+    cutoff = time.time() - _COVER_CACHE_MAX_AGE
+    for index, (mtime, path) in enumerate(files):
+        if mtime < cutoff or index >= _COVER_CACHE_MAX_FILES:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _read_cover(cache_path: Path) -> bytes | None:
+    """Read a cached cover, or None if it isn't cached (or was just pruned)."""
+    try:
+        return cache_path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _write_cover(cache_path: Path, image_data: bytes) -> None:
+    """Write a cover atomically so concurrent readers never see a partial file."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(image_data)
+    tmp_path.replace(cache_path)
+    prune_cover_cache()
+
+
+def _extract_thumbnail(zf: zipfile.ZipFile) -> bytes:
+    """Read the plate thumbnail from an open 3MF, or b"" if it has none."""
+    names = zf.namelist()
+    name_set = set(names)
+
+    # Try common thumbnail paths in 3MF files
+    for thumb_path in _THUMBNAIL_PATHS:
+        if thumb_path in name_set:
+            return zf.read(thumb_path)
+
+    # If no specific thumbnail found, try any PNG in Metadata
+    for name in names:
+        if name.startswith("Metadata/") and name.endswith(".png"):
+            return zf.read(name)
+
+    return b""
+
+
+async def _fetch_cover(
+    ip_address: str,
+    access_code: str,
+    subtask_name: str,
+    cache_path: Path,
+) -> bytes:
+    """Download the thumbnail for a job from the printer's 3MF and cache it on disk."""
     # Build 3MF filename from subtask_name
     # Bambu printers store files as "name.gcode.3mf"
     filename = subtask_name
     if not filename.endswith(".3mf"):
         filename = filename + ".gcode.3mf"
 
-    # Try to download the 3MF file from printer
-    temp_path = settings.archive_dir / "temp" / f"cover_{printer_id}_{filename}"
-    temp_path.parent.mkdir(parents=True, exist_ok=True)
-
     remote_paths = [
         f"/{filename}",  # Root directory (most common)
         f"/cache/{filename}",
@@ -246,99 +280,103 @@ async def get_printer_cover(printer_id: int, db: AsyncSession = Depends(get_db))
         f"/data/{filename}",
     ]
 
-    logger.info(f"Trying to download cover for '{filename}' from {printer.ip_address}")
+    logger.info(f"Trying to download cover for '{filename}' from {ip_address}")
 
+    # Read only the thumbnail from the 3MF instead of downloading the whole archive
     try:
-        downloaded = await download_file_try_paths_async(
-            printer.ip_address,
-            printer.access_code,
+        image_data = await read_zip_try_paths_async(
+            ip_address,
+            access_code,
             remote_paths,
-            temp_path,
+            _extract_thumbnail,
         )
+    except zipfile.BadZipFile as e:
+        raise HTTPException(500, f"Downloaded file is not a valid 3MF/ZIP: {e}")
     except Exception as e:
         logger.error(f"FTP download exception: {e}")
         raise HTTPException(500, f"FTP download failed: {e}")
 
-    if not downloaded:
-        raise HTTPException(404, f"Could not download 3MF file '{filename}' from printer {printer.ip_address}. Tried: {remote_paths}")
+    if image_data is None:
+        raise HTTPException(404, f"Could not download 3MF file '{filename}' from printer {ip_address}. Tried: {remote_paths}")
 
-    # Verify file actually exists and has content
-    if not temp_path.exists():
-        raise HTTPException(500, f"Download reported success but file not found: {temp_path}")
+    if not image_data:
+        raise HTTPException(404, "No thumbnail found in 3MF file")
 
-    file_size = temp_path.stat().st_size
-    logger.info(f"Downloaded file size: {file_size} bytes")
+    await asyncio.to_thread(_write_cover, cache_path, image_data)
+    return image_data
 
-    if file_size == 0:
-        temp_path.unlink()
-        raise HTTPException(500, f"Downloaded file is empty: {filename}")
 
-    try:
-        # Extract thumbnail from 3MF (which is a ZIP file)
-        try:
-            zf = zipfile.ZipFile(temp_path, 'r')
-        except zipfile.BadZipFile as e:
-            raise HTTPException(500, f"Downloaded file is not a valid 3MF/ZIP: {e}")
-        except Exception as e:
-            raise HTTPException(500, f"Failed to open 3MF file: {e}")
-
-        try:
-            # Try common thumbnail paths in 3MF files
-            thumbnail_paths = [
-                "Metadata/plate_1.png",
-                "Metadata/thumbnail.png",
-                "Metadata/plate_1_small.png",
-                "Thumbnails/thumbnail.png",
-                "thumbnail.png",
-            ]
-
-            for thumb_path in thumbnail_paths:
-                try:
-                    image_data = zf.read(thumb_path)
-                    # Cache the result
-                    _cover_cache[printer_id] = (subtask_name, image_data)
-                    return Response(content=image_data, media_type="image/png")
-                except KeyError:
-                    continue
-
-            # If no specific thumbnail found, try any PNG in Metadata
-            for name in zf.namelist():
-                if name.startswith("Metadata/") and name.endswith(".png"):
-                    image_data = zf.read(name)
-                    _cover_cache[printer_id] = (subtask_name, image_data)
-                    return Response(content=image_data, media_type="image/png")
-
-            raise HTTPException(404, "No thumbnail found in 3MF file")
-        finally:
-            zf.close()
-
-    finally:
-        if temp_path.exists():
-            temp_path.unlink()
+@router.get("/{printer_id}/cover")
+async def get_printer_cover(
+    request: Request,
+    printer: Printer = Depends(get_printer_or_404),
+):
+    """Get the cover image for the current print job."""
+    state = printer_manager.get_status(printer.id)
+    if not state:
+        raise HTTPException(404, "Printer not connected")
+
+    # Use subtask_name as the 3MF filename (gcode_file is the path inside the 3MF)
+    subtask_name = state.subtask_name
+    if not subtask_name:
+        raise HTTPException(404, f"No subtask_name in printer state (state={state.state})")
+
+    # A job's cover never changes, so clients polling with the ETag they
+    # already have can be answered without touching the cache or the printer
+    cover_key = _cover_key(printer.serial_number, subtask_name)
+    etag = f'"{cover_key}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    # Check cache
+    cache_path = _cover_cache_path(cover_key)
+    image_data = await asyncio.to_thread(_read_cover, cache_path)
+    if image_data is not None:
+        return Response(content=image_data, media_type="image/png", headers=headers)
+
+    # Coalesce concurrent requests for the same job into a single FTP fetch.
+    # Shielded so one client disconnecting doesn't cancel it for the others.
+    cache_key = (printer.id, subtask_name)
+    task = _cover_inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _fetch_cover(printer.ip_address, printer.access_code, subtask_name, cache_path)
+        )
+        _cover_inflight[cache_key] = task
+        task.add_done_callback(lambda _: _cover_inflight.pop(cache_key, None))
+
+    image_data = await asyncio.shield(task)
+    return Response(content=image_data, media_type="image/png", headers=headers)
 
 
 # ============================================
 # File Manager Endpoints
 # ============================================
 
+# Content types for files downloaded from the printer, by lowercase extension
+_CONTENT_TYPES = MappingProxyType({
+    "3mf": "application/vnd.ms-package.3dmanufacturing-3dmodel+xml",
+    "gcode": "text/plain",
+    "mp4": "video/mp4",
+    "avi": "video/x-msvideo",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "json": "application/json",
+    "txt": "text/plain",
+})
+
+
 @router.get("/{printer_id}/files")
 async def list_printer_files(
-    printer_id: int,
     path: str = "/",
-    db: AsyncSession = Depends(get_db),
+    printer: Printer = Depends(get_printer_or_404),
 ):
     """List files on the printer at the specified path."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
+    # Entries already carry their full path from the FTP listing
     files = await list_files_async(printer.ip_address, printer.access_code, path)
 
-    # Add full path to each file
-    for f in files:
-        f["path"] = f"{path.rstrip('/')}/{f['name']}" if path != "/" else f"/{f['name']}"
-
     return {
         "path": path,
         "files": files,
@@ -347,39 +385,22 @@ async def list_printer_files(
 
 @router.get("/{printer_id}/files/download")
 async def download_printer_file(
-    printer_id: int,
     path: str,
-    db: AsyncSession = Depends(get_db),
+    printer: Printer = Depends(get_printer_or_404),
 ):
     """Download a file from the printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
-    data = await download_file_bytes_async(printer.ip_address, printer.access_code, path)
-    if data is None:
+    # Stream from the printer rather than buffering large files (timelapses, 3MFs) in memory
+    stream = await open_file_stream_async(printer.ip_address, printer.access_code, path)
+    if stream is None:
         raise HTTPException(404, f"File not found: {path}")
 
     # Determine content type based on extension
-    filename = path.split("/")[-1]
-    ext = filename.lower().split(".")[-1] if "." in filename else ""
-
-    content_types = {
-        "3mf": "application/vnd.ms-package.3dmanufacturing-3dmodel+xml",
-        "gcode": "text/plain",
-        "mp4": "video/mp4",
-        "avi": "video/x-msvideo",
-        "png": "image/png",
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "json": "application/json",
-        "txt": "text/plain",
-    }
-    content_type = content_types.get(ext, "application/octet-stream")
+    filename = path.rsplit("/", 1)[-1]
+    ext = os.path.splitext(filename)[1][1:].lower()
+    content_type = _CONTENT_TYPES.get(ext, "application/octet-stream")
 
-    return Response(
-        content=data,
+    return StreamingResponse(
+        stream,
         media_type=content_type,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -387,16 +408,10 @@ async def download_printer_file(
 
 @router.delete("/{printer_id}/files")
 async def delete_printer_file(
-    printer_id: int,
     path: str,
-    db: AsyncSession = Depends(get_db),
+    printer: Printer = Depends(get_printer_or_404),
 ):
     """Delete a file from the printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
     success = await delete_file_async(printer.ip_address, printer.access_code, path)
     if not success:
         raise HTTPException(500, f"Failed to delete file: {path}")
@@ -406,15 +421,9 @@ async def delete_printer_file(
 
 @router.get("/{printer_id}/storage")
 async def get_printer_storage(
-    printer_id: int,
-    db: AsyncSession = Depends(get_db),
+    printer: Printer = Depends(get_printer_or_404),
 ):
     """Get storage information from the printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
     storage_info = await get_storage_info_async(printer.ip_address, printer.access_code)
 
     return storage_info or {"used_bytes": None, "free_bytes": None}
@@ -425,14 +434,9 @@ async def get_printer_storage(
 # ============================================
 
 @router.post("/{printer_id}/logging/enable")
-async def enable_mqtt_logging(printer_id: int, db: AsyncSession = Depends(get_db)):
+async def enable_mqtt_logging(printer: Printer = Depends(get_printer_or_404)):
     """Enable MQTT message logging for a printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
-    success = printer_manager.enable_logging(printer_id, True)
+    success = printer_manager.enable_logging(printer.id, True)
     if not success:
         raise HTTPException(400, "Printer not connected")
 
@@ -440,14 +444,9 @@ async def enable_mqtt_logging(printer_id: int, db: AsyncSession = Depends(get_db
 
 
 @router.post("/{printer_id}/logging/disable")
-async def disable_mqtt_logging(printer_id: int, db: AsyncSession = Depends(get_db)):
+async def disable_mqtt_logging(printer: Printer = Depends(get_printer_or_404)):
     """Disable MQTT message logging for a printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
-    success = printer_manager.enable_logging(printer_id, False)
+    success = printer_manager.enable_logging(printer.id, False)
     if not success:
         raise HTTPException(400, "Printer not connected")
 
@@ -455,35 +454,24 @@ async def disable_mqtt_logging(printer_id: int, db: AsyncSession = Depends(get_d
 
 
 @router.get("/{printer_id}/logging")
-async def get_mqtt_logs(printer_id: int, db: AsyncSession = Depends(get_db)):
+async def get_mqtt_logs(printer: Printer = Depends(get_printer_or_404)):
     """Get MQTT message logs for a printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
+    logs = printer_manager.get_logs(printer.id)
 
-    logs = printer_manager.get_logs(printer_id)
-    return {
-        "logging_enabled": printer_manager.is_logging_enabled(printer_id),
-        "logs": [
-            {
-                "timestamp": log.timestamp,
-                "topic": log.topic,
-                "direction": log.direction,
-                "payload": log.payload,
-            }
-            for log in logs
-        ],
-    }
+    # orjson serializes the MQTTLogEntry dataclasses directly, skipping the
+    # per-entry dicts and FastAPI's jsonable_encoder pass; payloads are
+    # embedded from the raw MQTT bytes without being decoded
+    return Response(
+        content=orjson.dumps({
+            "logging_enabled": printer_manager.is_logging_enabled(printer.id),
+            "logs": logs,
+        }),
+        media_type="application/json",
+    )
 
 
 @router.delete("/{printer_id}/logging")
-async def clear_mqtt_logs(printer_id: int, db: AsyncSession = Depends(get_db)):
+async def clear_mqtt_logs(printer: Printer = Depends(get_printer_or_404)):
     """Clear MQTT message logs for a printer."""
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
-    if not printer:
-        raise HTTPException(404, "Printer not found")
-
-    printer_manager.clear_logs(printer_id)
+    printer_manager.clear_logs(printer.id)
     return {"status": "cleared"}
@@ -1,9 +1,11 @@
 import shutil
+import time
 from pathlib import Path
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from backend.app.core.database import get_db
 from backend.app.models.settings import Settings
@@ -14,6 +16,24 @@ router = APIRouter(prefix="/settings", tags=["settings"])
 
 # Default settings
 DEFAULT_SETTINGS = AppSettings()
+_DEFAULTS_DICT = DEFAULT_SETTINGS.model_dump()
+
+# Stored values are strings; these keys are parsed back to their field types
+_BOOL_KEYS = frozenset({"auto_archive", "save_thumbnails", "capture_finish_photo", "spoolman_enabled", "check_updates"})
+_FLOAT_KEYS = frozenset({"default_filament_cost", "energy_cost_per_kwh"})
+
+# In-process cache for get_setting_cached: {key: (fetched_at, value)}
+_setting_cache: dict[str, tuple[float, str | None]] = {}
+
+# Full settings as last read or written through this router, so a PUT can
+# build its response without reading every row back
+_settings_snapshot: AppSettings | None = None
+
+
+def _clear_setting_caches() -> None:
+    global _settings_snapshot
+    _setting_cache.clear()
+    _settings_snapshot = None
 
 
 async def get_setting(db: AsyncSession, key: str) -> str | None:
@@ -23,6 +43,22 @@ async def get_setting(db: AsyncSession, key: str) -> str | None:
     return setting.value if setting else None
 
 
+async def get_setting_cached(db: AsyncSession, key: str, ttl: float = 60.0) -> str | None:
+    """Get a setting value, reusing a recent lookup for up to ttl seconds.
+
+    For hot paths that read rarely changing settings. The cache is cleared
+    whenever settings are written through this router.
+    """
+    now = time.monotonic()
+    hit = _setting_cache.get(key)
+    if hit and now - hit[0] < ttl:
+        return hit[1]
+
+    value = await get_setting(db, key)
+    _setting_cache[key] = (now, value)
+    return value
+
+
 async def set_setting(db: AsyncSession, key: str, value: str) -> None:
     """Set a single setting value."""
     result = await db.execute(select(Settings).where(Settings.key == key))
@@ -35,26 +71,40 @@ async def set_setting(db: AsyncSession, key: str, value: str) -> None:
         db.add(setting)
 
 
+async def set_settings(db: AsyncSession, values: dict[str, str]) -> None:
+    """Set multiple setting values in a single upsert statement."""
+    if not values:
+        return
+
+    stmt = sqlite_insert(Settings).values(
+        [{"key": key, "value": value} for key, value in values.items()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Settings.key],
+        set_={"value": stmt.excluded.value, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+
+
 @router.get("/", response_model=AppSettings)
 async def get_settings(db: AsyncSession = Depends(get_db)):
     """Get all application settings."""
-    settings_dict = DEFAULT_SETTINGS.model_dump()
-
+    global _settings_snapshot
     # Load saved settings from database
     result = await db.execute(select(Settings))
-    db_settings = result.scalars().all()
 
-    for setting in db_settings:
-        if setting.key in settings_dict:
-            # Parse the value based on the expected type
-            if setting.key in ["auto_archive", "save_thumbnails", "capture_finish_photo", "spoolman_enabled", "check_updates"]:
-                settings_dict[setting.key] = setting.value.lower() == "true"
-            elif setting.key in ["default_filament_cost", "energy_cost_per_kwh"]:
-                settings_dict[setting.key] = float(setting.value)
-            else:
-                settings_dict[setting.key] = setting.value
+    overrides = {}
+    for setting in result.scalars():
+        key = setting.key
+        if key in _BOOL_KEYS:
+            overrides[key] = setting.value.lower() == "true"
+        elif key in _FLOAT_KEYS:
+            overrides[key] = float(setting.value)
+        elif key in _DEFAULTS_DICT:
+            overrides[key] = setting.value
 
-    return AppSettings(**settings_dict)
+    _settings_snapshot = AppSettings(**(_DEFAULTS_DICT | overrides))
+    return _settings_snapshot
 
 
 @router.put("/", response_model=AppSettings)
@@ -63,31 +113,33 @@ async def update_settings(
     db: AsyncSession = Depends(get_db),
 ):
     """Update application settings."""
+    global _settings_snapshot
     update_data = settings_update.model_dump(exclude_unset=True)
 
-    for key, value in update_data.items():
-        # Convert value to string for storage
-        if isinstance(value, bool):
-            str_value = "true" if value else "false"
-        else:
-            str_value = str(value)
-        await set_setting(db, key, str_value)
+    # The response is the known settings merged with the update; they are
+    # only read from the database when this process hasn't seen them yet
+    current = _settings_snapshot or await get_settings(db)
+
+    # Convert values to strings for storage
+    await set_settings(db, {
+        key: ("true" if value else "false") if isinstance(value, bool) else str(value)
+        for key, value in update_data.items()
+    })
 
     await db.commit()
+    _setting_cache.clear()
+    _settings_snapshot = current.model_copy(update=update_data)
 
-    # Return updated settings
-    return await get_settings(db)
+    return _settings_snapshot
 
 
 @router.post("/reset", response_model=AppSettings)
 async def reset_settings(db: AsyncSession = Depends(get_db)):
     """Reset all settings to defaults."""
     # Delete all settings
-    result = await db.execute(select(Settings))
-    for setting in result.scalars().all():
-        await db.delete(setting)
-
+    await db.execute(delete(Settings))
     await db.commit()
+    _clear_setting_caches()
 
     return DEFAULT_SETTINGS
 
@@ -145,6 +197,7 @@ async def update_spoolman_settings(
         await set_setting(db, "spoolman_sync_mode", settings["spoolman_sync_mode"])
 
     await db.commit()
+    _clear_setting_caches()
 
     # Return updated settings
     return await get_spoolman_settings(db)
@@ -42,10 +42,7 @@ async def create_smart_plug(
     """Create a new smart plug."""
     # Validate printer_id if provided
     if data.printer_id:
-        result = await db.execute(
-            select(Printer).where(Printer.id == data.printer_id)
-        )
-        if not result.scalar_one_or_none():
+        if not await db.get(Printer, data.printer_id):
             raise HTTPException(400, "Printer not found")
 
         # Check if printer already has a plug assigned
@@ -105,10 +102,7 @@ async def update_smart_plug(
         new_printer_id = update_data["printer_id"]
 
         # Check printer exists
-        result = await db.execute(
-            select(Printer).where(Printer.id == new_printer_id)
-        )
-        if not result.scalar_one_or_none():
+        if not await db.get(Printer, new_printer_id):
             raise HTTPException(400, "Printer not found")
 
         # Check if that printer already has a different plug assigned
@@ -134,8 +134,7 @@ async def sync_printer_ams(
         raise HTTPException(status_code=503, detail="Spoolman is not reachable")
 
     # Get printer info
-    result = await db.execute(select(Printer).where(Printer.id == printer_id))
-    printer = result.scalar_one_or_none()
+    printer = await db.get(Printer, printer_id)
     if not printer:
         raise HTTPException(status_code=404, detail="Printer not found")
 
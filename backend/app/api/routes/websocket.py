@@ -1,7 +1,7 @@
 import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from backend.app.core.websocket import ws_manager
+from backend.app.core.websocket import encode_message, ws_manager
 from backend.app.services.printer_manager import printer_manager, printer_state_to_dict
 
 logger = logging.getLogger(__name__)
@@ -19,11 +19,11 @@ async def websocket_endpoint(websocket: WebSocket):
         # Send initial status of all printers
         statuses = printer_manager.get_all_statuses()
         for printer_id, state in statuses.items():
-            await websocket.send_json({
+            await websocket.send_text(encode_message({
                 "type": "printer_status",
                 "printer_id": printer_id,
-                "data": printer_state_to_dict(state),
-            })
+                "data": printer_state_to_dict(state, printer_id),
+            }))
         logger.info(f"Sent initial status for {len(statuses)} printers")
 
         # Keep connection alive and handle incoming messages
@@ -40,11 +40,11 @@ async def websocket_endpoint(websocket: WebSocket):
                 if printer_id:
                     state = printer_manager.get_status(printer_id)
                     if state:
-                        await websocket.send_json({
+                        await websocket.send_text(encode_message({
                             "type": "printer_status",
                             "printer_id": printer_id,
-                            "data": printer_state_to_dict(state),
-                        })
+                            "data": printer_state_to_dict(state, printer_id),
+                        }))
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected normally")
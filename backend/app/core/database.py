@@ -43,6 +43,23 @@ async def init_db():
         await run_migrations(conn)
 
 
+async def warm_statement_cache():
+    """Compile the hottest queries once at startup so the first requests don't pay for it.
+
+    Compiled SQL is cached on the engine, so later statements with the same
+    structure reuse it regardless of which session runs them.
+    """
+    from sqlalchemy import select
+    from backend.app.models.printer import Printer
+    from backend.app.models.settings import Settings
+
+    async with async_session() as session:
+        await session.get(Printer, 0)
+        await session.execute(select(Printer).order_by(Printer.name))
+        await session.execute(select(Settings))
+        await session.execute(select(Settings).where(Settings.key == ""))
+
+
 async def run_migrations(conn):
     """Add new columns to existing tables if they don't exist."""
     from sqlalchemy import text
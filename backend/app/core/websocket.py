@@ -1,9 +1,15 @@
 import asyncio
-import json
 from typing import Any
+
+import orjson
 from fastapi import WebSocket
 
 
+def encode_message(message: dict[str, Any]) -> str:
+    """Serialize a WebSocket message to JSON text (clients expect text frames)."""
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class ConnectionManager:
     """Manages WebSocket connections and broadcasts."""
 
@@ -28,7 +34,7 @@ class ConnectionManager:
         if not self.active_connections:
             return
 
-        data = json.dumps(message)
+        data = encode_message(message)
         async with self._lock:
             disconnected = []
             for connection in self.active_connections:
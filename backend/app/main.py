@@ -1,12 +1,16 @@
 import asyncio
+import hashlib
 import logging
 import os
+import shutil
+import tempfile
 from datetime import datetime
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 
 # Import settings first for logging configuration
 from backend.app.core.config import settings as app_settings, APP_VERSION
@@ -48,11 +52,12 @@ if not app_settings.debug:
     logging.getLogger("httpx").setLevel(logging.WARNING)
 
 logging.info(f"BambuTrack starting - debug={app_settings.debug}, log_level={log_level_str}")
+logger = logging.getLogger(__name__)
+
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 
-from backend.app.core.database import init_db, async_session
-from sqlalchemy import select, or_
+from backend.app.core.database import init_db, async_session, warm_statement_cache
+from sqlalchemy import or_, select, update
 from backend.app.core.websocket import ws_manager
 from backend.app.api.routes import printers, archives, websocket, filaments, cloud, smart_plugs, print_queue, kprofiles, notifications, spoolman, updates, maintenance
 from backend.app.api.routes import settings as settings_routes
@@ -65,7 +70,7 @@ from backend.app.services.printer_manager import (
 from backend.app.services.print_scheduler import scheduler as print_scheduler
 from backend.app.services.bambu_mqtt import PrinterState
 from backend.app.services.archive import ArchiveService
-from backend.app.services.bambu_ftp import download_file_async
+from backend.app.services.bambu_ftp import download_first_existing_async, download_matching_file_async
 from backend.app.services.smart_plug_manager import smart_plug_manager
 from backend.app.services.tasmota import tasmota_service
 from backend.app.models.smart_plug import SmartPlug
@@ -73,118 +78,162 @@ from backend.app.services.spoolman import get_spoolman_client, init_spoolman_cli
 from backend.app.api.routes.maintenance import _get_printer_maintenance_internal, ensure_default_types
 
 
-# Track active prints: {(printer_id, filename): archive_id}
-_active_prints: dict[tuple[int, str], int] = {}
+@dataclass(slots=True)
+class ActivePrint:
+    """A print being tracked between its start and completion events."""
+
+    archive_id: int
+    names: frozenset[str]  # Normalized names the print may be reported under
+    start_kwh: float | None = None  # Smart plug energy total at print start
+
+
+# Track active prints: {printer_id: ActivePrint} (one print per printer)
+_active_prints: dict[int, ActivePrint] = {}
 
 # Track expected prints from reprint/scheduled (skip auto-archiving for these)
-# {(printer_id, filename): archive_id}
+# {(printer_id, normalized name): archive_id}
 _expected_prints: dict[tuple[int, str], int] = {}
 
-# Track starting energy for prints: {archive_id: starting_kwh}
-_print_energy_start: dict[int, float] = {}
+
+def _normalize_print_name(name: str) -> str:
+    """Reduce a reported filename or subtask name to a comparable key.
+
+    "/data/Cube.gcode.3mf", "Cube.3mf" and "cube" all become "cube".
+    """
+    name = name.rsplit("/", 1)[-1].lower()
+    for ext in (".3mf", ".gcode"):
+        name = name.removesuffix(ext)
+    return name
+
+
+def _print_names(*names: str) -> frozenset[str]:
+    return frozenset(_normalize_print_name(name) for name in names if name)
 
 
 def register_expected_print(printer_id: int, filename: str, archive_id: int):
     """Register an expected print from reprint/scheduled so we don't create duplicate archives."""
-    # Store with multiple filename variations to catch different naming patterns
-    _expected_prints[(printer_id, filename)] = archive_id
-    # Also store without .3mf extension if present
-    if filename.endswith(".3mf"):
-        base = filename[:-4]
-        _expected_prints[(printer_id, base)] = archive_id
-        _expected_prints[(printer_id, f"{base}.gcode")] = archive_id
-    logging.getLogger(__name__).info(
+    # One normalized key covers the "Name", "Name.3mf" and "Name.gcode.3mf" variants
+    _expected_prints[(printer_id, _normalize_print_name(filename))] = archive_id
+    logger.info(
         f"Registered expected print: printer={printer_id}, file={filename}, archive={archive_id}"
     )
 
 
+# Common Bambu 3MF naming patterns for a print name, most likely first
+_3MF_SUFFIXES = (".gcode.3mf", ".3mf")
+
+# Printer directories a started print's 3MF may be stored in, in probe order
+_REMOTE_3MF_DIRS = ("/cache/", "/model/", "/")
+
 _last_status_broadcast: dict[int, str] = {}
+_last_status_sent: dict[int, dict] = {}  # Last status dict broadcast per printer
 _nozzle_count_updated: set[int] = set()  # Track printers where we've updated nozzle_count
 
 
-async def _report_spoolman_usage(printer_id: int, archive_id: int, logger):
+async def _report_spoolman_usage(printer_id: int, archive_id: int, db):
     """Report filament usage to Spoolman after print completion.
 
     This finds the spool by RFID tag_uid from current AMS state and reports
     the filament_used_grams from the archive metadata.
     """
-    async with async_session() as db:
-        from backend.app.api.routes.settings import get_setting
-        from backend.app.models.archive import PrintArchive
+    from backend.app.api.routes.settings import get_setting
+    from backend.app.models.archive import PrintArchive
 
-        # Check if Spoolman is enabled
-        spoolman_enabled = await get_setting(db, "spoolman_enabled")
-        if not spoolman_enabled or spoolman_enabled.lower() != "true":
-            return
+    # Check if Spoolman is enabled
+    spoolman_enabled = await get_setting(db, "spoolman_enabled")
+    if not spoolman_enabled or spoolman_enabled.lower() != "true":
+        return
 
-        # Get Spoolman URL
-        spoolman_url = await get_setting(db, "spoolman_url")
-        if not spoolman_url:
-            return
+    # Get Spoolman URL
+    spoolman_url = await get_setting(db, "spoolman_url")
+    if not spoolman_url:
+        return
 
-        # Get or create Spoolman client
-        client = await get_spoolman_client()
-        if not client:
-            client = await init_spoolman_client(spoolman_url)
+    # Get or create Spoolman client
+    client = await get_spoolman_client()
+    if not client:
+        client = await init_spoolman_client(spoolman_url)
 
-        # Check if Spoolman is reachable
-        if not await client.health_check():
-            logger.warning(f"Spoolman not reachable for usage reporting")
-            return
+    # Check if Spoolman is reachable
+    if not await client.health_check():
+        logger.warning(f"Spoolman not reachable for usage reporting")
+        return
 
-        # Get archive to find filament usage
-        result = await db.execute(
-            select(PrintArchive).where(PrintArchive.id == archive_id)
-        )
-        archive = result.scalar_one_or_none()
-        if not archive or not archive.filament_used_grams:
-            logger.debug(f"No filament usage data for archive {archive_id}")
-            return
+    # Get archive to find filament usage
+    archive = await db.get(PrintArchive, archive_id)
+    if not archive or not archive.filament_used_grams:
+        logger.debug(f"No filament usage data for archive {archive_id}")
+        return
 
-        filament_used = archive.filament_used_grams
-        logger.info(f"[SPOOLMAN] Archive {archive_id} used {filament_used}g of filament")
+    filament_used = archive.filament_used_grams
+    logger.info(f"[SPOOLMAN] Archive {archive_id} used {filament_used}g of filament")
 
-        # Get current AMS state from printer to find the active spool
-        state = printer_manager.get_status(printer_id)
-        if not state or not state.raw_data:
-            logger.debug(f"No printer state available for usage reporting")
-            return
+    # Get current AMS state from printer to find the active spool
+    state = printer_manager.get_status(printer_id)
+    if not state or not state.raw_data:
+        logger.debug(f"No printer state available for usage reporting")
+        return
 
-        ams_data = state.raw_data.get("ams")
-        if not ams_data:
-            logger.debug(f"No AMS data available for usage reporting")
-            return
+    ams_data = state.raw_data.get("ams")
+    if not ams_data:
+        logger.debug(f"No AMS data available for usage reporting")
+        return
+
+    # Find spools with RFID tags in Spoolman and report usage
+    # For now, we report usage to the first spool found with a matching tag
+    # TODO: In future, track which specific trays were used during the print
+    spools_updated = 0
+    for ams_unit in ams_data:
+        ams_id = int(ams_unit.get("id", 0))
+        trays = ams_unit.get("tray", [])
+
+        for tray_data in trays:
+            tag_uid = tray_data.get("tag_uid")
+            if not tag_uid:
+                continue
+
+            # Find spool in Spoolman by tag
+            spool = await client.find_spool_by_tag(tag_uid)
+            if spool:
+                # Report usage to Spoolman
+                result = await client.use_spool(spool["id"], filament_used)
+                if result:
+                    logger.info(
+                        f"[SPOOLMAN] Reported {filament_used}g usage to spool {spool['id']} "
+                        f"(tag: {tag_uid})"
+                    )
+                    spools_updated += 1
+                    # Only report to one spool for single-material prints
+                    # Multi-material prints would need more sophisticated tracking
+                    return
+
+    if spools_updated == 0:
+        logger.debug(f"No matching Spoolman spools found for printer {printer_id}")
+
+
+async def _load_printer_context(db, printer_id: int, archive_id: int | None = None):
+    """Load a printer, its smart plug and optionally an archive in one query.
+
+    Returns (printer, plug, archive); any of them may be None.
+    """
+    from backend.app.models.archive import PrintArchive
+    from backend.app.models.printer import Printer
+
+    stmt = (
+        select(Printer, SmartPlug)
+        .outerjoin(SmartPlug, SmartPlug.printer_id == Printer.id)
+        .where(Printer.id == printer_id)
+    )
+    if archive_id is not None:
+        stmt = stmt.add_columns(PrintArchive).outerjoin(
+            PrintArchive, PrintArchive.id == archive_id
+        )
 
-        # Find spools with RFID tags in Spoolman and report usage
-        # For now, we report usage to the first spool found with a matching tag
-        # TODO: In future, track which specific trays were used during the print
-        spools_updated = 0
-        for ams_unit in ams_data:
-            ams_id = int(ams_unit.get("id", 0))
-            trays = ams_unit.get("tray", [])
-
-            for tray_data in trays:
-                tag_uid = tray_data.get("tag_uid")
-                if not tag_uid:
-                    continue
-
-                # Find spool in Spoolman by tag
-                spool = await client.find_spool_by_tag(tag_uid)
-                if spool:
-                    # Report usage to Spoolman
-                    result = await client.use_spool(spool["id"], filament_used)
-                    if result:
-                        logger.info(
-                            f"[SPOOLMAN] Reported {filament_used}g usage to spool {spool['id']} "
-                            f"(tag: {tag_uid})"
-                        )
-                        spools_updated += 1
-                        # Only report to one spool for single-material prints
-                        # Multi-material prints would need more sophisticated tracking
-                        return
-
-        if spools_updated == 0:
-            logger.debug(f"No matching Spoolman spools found for printer {printer_id}")
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        archive = await db.get(PrintArchive, archive_id) if archive_id is not None else None
+        return None, None, archive
+    return row[0], row[1], row[2] if archive_id is not None else None
 
 
 async def on_printer_status_change(printer_id: int, state: PrinterState):
@@ -203,14 +252,11 @@ async def on_printer_status_change(printer_id: int, state: PrinterState):
         # Update nozzle_count in database
         async with async_session() as db:
             from backend.app.models.printer import Printer
-            result = await db.execute(
-                select(Printer).where(Printer.id == printer_id)
-            )
-            printer = result.scalar_one_or_none()
+            printer = await db.get(Printer, printer_id)
             if printer and printer.nozzle_count != 2:
                 printer.nozzle_count = 2
                 await db.commit()
-                logging.getLogger(__name__).info(
+                logger.info(
                     f"Auto-detected dual-nozzle printer {printer_id}, updated nozzle_count=2"
                 )
 
@@ -223,17 +269,21 @@ async def on_printer_status_change(printer_id: int, state: PrinterState):
 
     _last_status_broadcast[printer_id] = status_key
 
-    await ws_manager.send_printer_status(
-        printer_id,
-        printer_state_to_dict(state, printer_id),
-    )
+    # Clients merge printer_status data into their cached status (and get a
+    # full snapshot on connect), so only send the fields that changed
+    status = printer_state_to_dict(state, printer_id)
+    last_status = _last_status_sent.get(printer_id)
+    _last_status_sent[printer_id] = status
+    if last_status is not None:
+        status = {k: v for k, v in status.items() if last_status.get(k) != v}
+        if not status:
+            return
+
+    await ws_manager.send_printer_status(printer_id, status)
 
 
 async def on_ams_change(printer_id: int, ams_data: list):
     """Handle AMS data changes - sync to Spoolman if enabled and auto mode."""
-    import logging
-    logger = logging.getLogger(__name__)
-
     try:
         async with async_session() as db:
             from backend.app.api.routes.settings import get_setting
@@ -265,10 +315,7 @@ async def on_ams_change(printer_id: int, ams_data: list):
                 return
 
             # Get printer name for location
-            result = await db.execute(
-                select(Printer).where(Printer.id == printer_id)
-            )
-            printer = result.scalar_one_or_none()
+            printer = await db.get(Printer, printer_id)
             printer_name = printer.name if printer else f"Printer {printer_id}"
 
             # Sync each AMS tray
@@ -293,25 +340,15 @@ async def on_ams_change(printer_id: int, ams_data: list):
                 logger.info(f"Auto-synced {synced} AMS trays to Spoolman for printer {printer_id}")
 
     except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Spoolman AMS sync failed: {e}")
+        logger.warning(f"Spoolman AMS sync failed: {e}")
 
 
 async def on_print_start(printer_id: int, data: dict):
     """Handle print start - archive the 3MF file immediately."""
-    import logging
-    logger = logging.getLogger(__name__)
-
     await ws_manager.send_print_start(printer_id, data)
 
     async with async_session() as db:
-        from backend.app.models.printer import Printer
-        from backend.app.services.bambu_ftp import list_files_async
-
-        result = await db.execute(
-            select(Printer).where(Printer.id == printer_id)
-        )
-        printer = result.scalar_one_or_none()
+        printer, plug, _ = await _load_printer_context(db, printer_id)
 
         if not printer or not printer.auto_archive:
             return
@@ -326,27 +363,10 @@ async def on_print_start(printer_id: int, data: dict):
             return
 
         # Check if this is an expected print from reprint/scheduled
-        # Build list of possible keys to check
-        expected_keys = []
-        if subtask_name:
-            expected_keys.append((printer_id, subtask_name))
-            expected_keys.append((printer_id, f"{subtask_name}.3mf"))
-            expected_keys.append((printer_id, f"{subtask_name}.gcode.3mf"))
-        if filename:
-            fname = filename.split("/")[-1] if "/" in filename else filename
-            expected_keys.append((printer_id, fname))
-            # Strip extensions to match
-            base = fname.replace(".gcode", "").replace(".3mf", "")
-            expected_keys.append((printer_id, base))
-            expected_keys.append((printer_id, f"{base}.3mf"))
-
         expected_archive_id = None
-        for key in expected_keys:
-            expected_archive_id = _expected_prints.pop(key, None)
+        for name in _print_names(subtask_name, filename):
+            expected_archive_id = _expected_prints.pop((printer_id, name), None)
             if expected_archive_id:
-                # Clean up other possible keys for this print
-                for other_key in expected_keys:
-                    _expected_prints.pop(other_key, None)
                 break
 
         if expected_archive_id:
@@ -367,22 +387,18 @@ async def on_print_start(printer_id: int, data: dict):
                 await db.commit()
 
                 # Track as active print
-                _active_prints[(printer_id, archive.filename)] = archive.id
-                if subtask_name:
-                    _active_prints[(printer_id, f"{subtask_name}.3mf")] = archive.id
+                active = _active_prints[printer_id] = ActivePrint(
+                    archive.id, _print_names(archive.filename, filename, subtask_name)
+                )
 
                 # Set up energy tracking
                 try:
-                    plug_result = await db.execute(
-                        select(SmartPlug).where(SmartPlug.printer_id == printer_id)
-                    )
-                    plug = plug_result.scalar_one_or_none()
                     logger.info(f"[ENERGY] Print start - archive {archive.id}, printer {printer_id}, plug found: {plug is not None}")
                     if plug:
                         energy = await tasmota_service.get_energy(plug)
                         logger.info(f"[ENERGY] Energy response from plug: {energy}")
                         if energy and energy.get("total") is not None:
-                            _print_energy_start[archive.id] = energy["total"]
+                            active.start_kwh = energy["total"]
                             logger.info(f"[ENERGY] Recorded starting energy for archive {archive.id}: {energy['total']} kWh")
                         else:
                             logger.warning(f"[ENERGY] No 'total' in energy response for archive {archive.id}")
@@ -420,18 +436,18 @@ async def on_print_start(printer_id: int, data: dict):
         if existing_archive:
             logger.info(f"Skipping duplicate - already have printing archive {existing_archive.id} for {check_name}")
             # Track this as the active print
-            _active_prints[(printer_id, existing_archive.filename)] = existing_archive.id
+            active = _active_prints.get(printer_id)
+            if not active or active.archive_id != existing_archive.id:
+                active = _active_prints[printer_id] = ActivePrint(
+                    existing_archive.id, _print_names(existing_archive.filename, filename, subtask_name)
+                )
             # Also set up energy tracking if not already tracked
-            if existing_archive.id not in _print_energy_start:
+            if active.start_kwh is None:
                 try:
-                    plug_result = await db.execute(
-                        select(SmartPlug).where(SmartPlug.printer_id == printer_id)
-                    )
-                    plug = plug_result.scalar_one_or_none()
                     if plug:
                         energy = await tasmota_service.get_energy(plug)
                         if energy and energy.get("total") is not None:
-                            _print_energy_start[existing_archive.id] = energy["total"]
+                            active.start_kwh = energy["total"]
                             logger.info(f"Recorded starting energy for existing archive {existing_archive.id}: {energy['total']} kWh")
                 except Exception as e:
                     logger.warning(f"Failed to record starting energy for existing archive: {e}")
@@ -443,124 +459,92 @@ async def on_print_start(printer_id: int, data: dict):
         # Bambu printers typically store files as "Name.gcode.3mf"
         # The subtask_name is usually the best source for the filename
         if subtask_name:
-            # Try common Bambu naming patterns
-            possible_names.append(f"{subtask_name}.gcode.3mf")
-            possible_names.append(f"{subtask_name}.3mf")
+            possible_names.extend(subtask_name + suffix for suffix in _3MF_SUFFIXES)
 
         # Try original filename with .3mf extension
         if filename:
             # Extract just the filename part, not the full path
-            fname = filename.split("/")[-1] if "/" in filename else filename
+            fname = filename.rsplit("/", 1)[-1]
             if fname.endswith(".3mf"):
                 possible_names.append(fname)
-            elif fname.endswith(".gcode"):
-                base = fname.rsplit(".", 1)[0]
-                possible_names.append(f"{base}.gcode.3mf")
-                possible_names.append(f"{base}.3mf")
             else:
-                possible_names.append(f"{fname}.gcode.3mf")
-                possible_names.append(f"{fname}.3mf")
+                base = fname.removesuffix(".gcode")
+                possible_names.extend(base + suffix for suffix in _3MF_SUFFIXES)
 
         # Remove duplicates while preserving order
-        seen = set()
-        possible_names = [x for x in possible_names if not (x in seen or seen.add(x))]
+        possible_names = list(dict.fromkeys(possible_names))
 
         logger.info(f"Trying filenames: {possible_names}")
 
-        # Try to find and download the 3MF file
-        temp_path = None
-        downloaded_filename = None
-
-        for try_filename in possible_names:
-            if not try_filename.endswith(".3mf"):
-                continue
-
-            remote_paths = [
-                f"/cache/{try_filename}",
-                f"/model/{try_filename}",
-                f"/{try_filename}",
-            ]
+        # Staging dir for the 3MF download, removed once it has been archived
+        # (archive_dir/temp is created at startup)
+        temp_dir = Path(await asyncio.to_thread(tempfile.mkdtemp, dir=app_settings.archive_dir / "temp"))
+        try:
+            downloaded_filename = None
 
-            temp_path = app_settings.archive_dir / "temp" / try_filename
-            temp_path.parent.mkdir(parents=True, exist_ok=True)
+            # Probe candidates with SIZE over one connection and download
+            # only the first one that exists
+            try:
+                downloaded_filename = await download_first_existing_async(
+                    printer.ip_address,
+                    printer.access_code,
+                    possible_names,
+                    list(_REMOTE_3MF_DIRS),
+                    temp_dir,
+                )
+                if downloaded_filename:
+                    logger.info(f"Downloaded: {downloaded_filename}")
+            except Exception as e:
+                logger.debug(f"FTP download failed for {possible_names}: {e}")
 
-            for remote_path in remote_paths:
-                logger.debug(f"Trying FTP download: {remote_path}")
+            # If still not found, try listing /cache to find matching file
+            if not downloaded_filename and (filename or subtask_name):
+                search_term = (subtask_name or filename).lower().replace(".gcode", "").replace(".3mf", "")
                 try:
-                    if await download_file_async(
+                    downloaded_filename = await download_matching_file_async(
                         printer.ip_address,
                         printer.access_code,
-                        remote_path,
-                        temp_path,
-                    ):
-                        downloaded_filename = try_filename
-                        logger.info(f"Downloaded: {remote_path}")
-                        break
+                        "/cache",
+                        lambda name: name.endswith(".3mf") and search_term in name.lower(),
+                        temp_dir,
+                    )
+                    if downloaded_filename:
+                        logger.info(f"Found and downloaded from cache: {downloaded_filename}")
                 except Exception as e:
-                    logger.debug(f"FTP download failed for {remote_path}: {e}")
+                    logger.warning(f"Failed to search cache: {e}")
 
-            if downloaded_filename:
-                break
-
-        # If still not found, try listing /cache to find matching file
-        if not downloaded_filename and (filename or subtask_name):
-            search_term = (subtask_name or filename).lower().replace(".gcode", "").replace(".3mf", "")
-            try:
-                cache_files = await list_files_async(printer.ip_address, printer.access_code, "/cache")
-                for f in cache_files:
-                    if f.get("is_directory"):
-                        continue
-                    fname = f.get("name", "")
-                    if fname.endswith(".3mf") and search_term in fname.lower():
-                        temp_path = app_settings.archive_dir / "temp" / fname
-                        temp_path.parent.mkdir(parents=True, exist_ok=True)
-                        if await download_file_async(
-                            printer.ip_address,
-                            printer.access_code,
-                            f"/cache/{fname}",
-                            temp_path,
-                        ):
-                            downloaded_filename = fname
-                            logger.info(f"Found and downloaded from cache: {fname}")
-                            break
-            except Exception as e:
-                logger.warning(f"Failed to list cache: {e}")
+            if not downloaded_filename:
+                logger.warning(f"Could not find 3MF file for print: {filename or subtask_name}")
+                return
 
-        if not downloaded_filename or not temp_path:
-            logger.warning(f"Could not find 3MF file for print: {filename or subtask_name}")
-            return
+            temp_path = temp_dir / downloaded_filename
 
-        try:
-            # Archive the file with status "printing"
+            # Archive the file with status "printing" (moved, not copied, since
+            # the temp dir is on the same filesystem as the archive)
             service = ArchiveService(db)
             archive = await service.archive_print(
                 printer_id=printer_id,
                 source_file=temp_path,
                 print_data={**data, "status": "printing"},
+                move_source=True,
             )
 
             if archive:
-                # Track this active print (use both original filename and downloaded filename)
-                _active_prints[(printer_id, downloaded_filename)] = archive.id
-                if filename and filename != downloaded_filename:
-                    _active_prints[(printer_id, filename)] = archive.id
-                if subtask_name:
-                    _active_prints[(printer_id, f"{subtask_name}.3mf")] = archive.id
+                # Track this active print (under both original filename and downloaded filename)
+                active = _active_prints[printer_id] = ActivePrint(
+                    archive.id, _print_names(downloaded_filename, filename, subtask_name)
+                )
 
                 logger.info(f"Created archive {archive.id} for {downloaded_filename}")
 
                 # Record starting energy from smart plug if available
                 try:
-                    plug_result = await db.execute(
-                        select(SmartPlug).where(SmartPlug.printer_id == printer_id)
-                    )
-                    plug = plug_result.scalar_one_or_none()
                     logger.info(f"[ENERGY] Auto-archive print start - archive {archive.id}, printer {printer_id}, plug found: {plug is not None}")
                     if plug:
                         energy = await tasmota_service.get_energy(plug)
                         logger.info(f"[ENERGY] Auto-archive energy response: {energy}")
                         if energy and energy.get("total") is not None:
-                            _print_energy_start[archive.id] = energy["total"]
+                            active.start_kwh = energy["total"]
                             logger.info(f"[ENERGY] Recorded starting energy for archive {archive.id}: {energy['total']} kWh")
                         else:
                             logger.warning(f"[ENERGY] No 'total' in energy response for archive {archive.id}")
@@ -577,37 +561,24 @@ async def on_print_start(printer_id: int, data: dict):
                     "status": archive.status,
                 })
         finally:
-            if temp_path and temp_path.exists():
-                temp_path.unlink()
+            # Clean up the staging dir (still holds the 3MF if it wasn't archived)
+            await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
 
-    # Smart plug automation: turn on plug when print starts
-    try:
-        async with async_session() as db:
+        # Smart plug automation: turn on plug when print starts
+        try:
             await smart_plug_manager.on_print_start(printer_id, db)
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Smart plug on_print_start failed: {e}")
+        except Exception as e:
+            logger.warning(f"Smart plug on_print_start failed: {e}")
 
-    # Send print start notifications
-    try:
-        async with async_session() as db:
-            from backend.app.models.printer import Printer
-            result = await db.execute(
-                select(Printer).where(Printer.id == printer_id)
-            )
-            printer = result.scalar_one_or_none()
-            printer_name = printer.name if printer else f"Printer {printer_id}"
-            await notification_service.on_print_start(printer_id, printer_name, data, db)
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Notification on_print_start failed: {e}")
+        # Send print start notifications
+        try:
+            await notification_service.on_print_start(printer_id, printer.name, data, db)
+        except Exception as e:
+            logger.warning(f"Notification on_print_start failed: {e}")
 
 
 async def on_print_complete(printer_id: int, data: dict):
     """Handle print completion - update the archive status."""
-    import logging
-    logger = logging.getLogger(__name__)
-
     await ws_manager.send_print_complete(printer_id, data)
 
     filename = data.get("filename", "")
@@ -619,61 +590,20 @@ async def on_print_complete(printer_id: int, data: dict):
 
     logger.info(f"Print complete - filename: {filename}, subtask: {subtask_name}, status: {data.get('status')}")
 
-    # Build list of possible keys to try (matching how they were registered in on_print_start)
-    possible_keys = []
-
-    # Try subtask_name variations first (most reliable for matching)
-    if subtask_name:
-        possible_keys.append((printer_id, f"{subtask_name}.3mf"))
-        possible_keys.append((printer_id, f"{subtask_name}.gcode.3mf"))
-        possible_keys.append((printer_id, subtask_name))
-
-    # Try filename variations
-    if filename:
-        # Extract just the filename if it's a path
-        fname = filename.split("/")[-1] if "/" in filename else filename
-
-        if fname.endswith(".3mf"):
-            possible_keys.append((printer_id, fname))
-        elif fname.endswith(".gcode"):
-            base_name = fname.rsplit(".", 1)[0]
-            possible_keys.append((printer_id, f"{base_name}.gcode.3mf"))
-            possible_keys.append((printer_id, f"{base_name}.3mf"))
-            possible_keys.append((printer_id, fname))
-        else:
-            possible_keys.append((printer_id, f"{fname}.gcode.3mf"))
-            possible_keys.append((printer_id, f"{fname}.3mf"))
-            possible_keys.append((printer_id, fname))
-
-        # Also try full path versions
-        if filename.endswith(".3mf"):
-            possible_keys.append((printer_id, filename))
-        elif filename.endswith(".gcode"):
-            base_name = filename.rsplit(".", 1)[0]
-            possible_keys.append((printer_id, f"{base_name}.3mf"))
-            possible_keys.append((printer_id, filename))
-        else:
-            possible_keys.append((printer_id, f"{filename}.3mf"))
-            possible_keys.append((printer_id, filename))
-
     # Find the archive for this print
-    logger.info(f"Looking for archive in _active_prints, keys to try: {possible_keys[:5]}...")
-    logger.info(f"Current _active_prints: {list(_active_prints.keys())}")
+    active = _active_prints.pop(printer_id, None)
+    logger.info(f"Tracked active print for printer {printer_id}: {active}")
     archive_id = None
-    for key in possible_keys:
-        archive_id = _active_prints.pop(key, None)
-        if archive_id:
-            logger.info(f"Found archive {archive_id} with key {key}")
-            # Also clean up any other keys pointing to this archive
-            keys_to_remove = [k for k, v in _active_prints.items() if v == archive_id]
-            for k in keys_to_remove:
-                _active_prints.pop(k, None)
-            break
-
-    if not archive_id:
-        # Try to find by filename or subtask_name if not tracked (for prints started before app)
-        async with async_session() as db:
-            from backend.app.models.archive import PrintArchive
+    if active and not active.names.isdisjoint(_print_names(filename, subtask_name)):
+        archive_id = active.archive_id
+        logger.info(f"Found archive {archive_id} for {filename or subtask_name}")
+
+    async with async_session() as db:
+        from backend.app.api.routes.settings import get_setting_cached
+        from backend.app.models.archive import PrintArchive
+
+        if not archive_id:
+            # Try to find by filename or subtask_name if not tracked (for prints started before app)
 
             # Try matching by subtask_name (stored as print_name) first
             if subtask_name:
@@ -707,12 +637,11 @@ async def on_print_complete(printer_id: int, data: dict):
                 if archive:
                     archive_id = archive.id
 
-    if not archive_id:
-        logger.warning(f"Could not find archive for print complete: filename={filename}, subtask={subtask_name}")
-        return
+        if not archive_id:
+            logger.warning(f"Could not find archive for print complete: filename={filename}, subtask={subtask_name}")
+            return
 
-    # Update archive status
-    async with async_session() as db:
+        # Update archive status
         service = ArchiveService(db)
         status = data.get("status", "completed")
         await service.update_archive_status(
@@ -726,24 +655,34 @@ async def on_print_complete(printer_id: int, data: dict):
             "status": status,
         })
 
-    # Report filament usage to Spoolman if print completed successfully
-    if data.get("status") == "completed":
+        # Report filament usage to Spoolman if print completed successfully
+        if data.get("status") == "completed":
+            try:
+                await _report_spoolman_usage(printer_id, archive_id, db)
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"Spoolman usage reporting failed: {e}")
+
+        # Rows shared by the steps below. They are detached so that a step
+        # rolling back the session does not expire them for the next one.
         try:
-            await _report_spoolman_usage(printer_id, archive_id, logger)
+            printer, plug, archive = await _load_printer_context(db, printer_id, archive_id)
+            for obj in (printer, plug, archive):
+                if obj is not None:
+                    db.expunge(obj)
         except Exception as e:
-            logger.warning(f"Spoolman usage reporting failed: {e}")
+            await db.rollback()
+            logger.warning(f"Failed to load printer context for printer {printer_id}: {e}")
+            printer, plug, archive = None, None, None
+        printer_name = printer.name if printer else f"Printer {printer_id}"
 
-    # Calculate energy used for this print (always per-print: end - start)
-    try:
-        starting_kwh = _print_energy_start.pop(archive_id, None)
-        logger.info(f"[ENERGY] Print complete for archive {archive_id}, starting_kwh={starting_kwh}")
+        # Energy and photo results, written to the archive in a single UPDATE
+        archive_changes = {}
 
-        async with async_session() as db:
-            # Get smart plug for this printer (SmartPlug is imported at module level)
-            plug_result = await db.execute(
-                select(SmartPlug).where(SmartPlug.printer_id == printer_id)
-            )
-            plug = plug_result.scalar_one_or_none()
+        # Calculate energy used for this print (always per-print: end - start)
+        try:
+            starting_kwh = active.start_kwh if active and active.archive_id == archive_id else None
+            logger.info(f"[ENERGY] Print complete for archive {archive_id}, starting_kwh={starting_kwh}")
 
             if plug:
                 energy = await tasmota_service.get_energy(plug)
@@ -763,121 +702,87 @@ async def on_print_complete(printer_id: int, data: dict):
 
                 if energy_used is not None and energy_used >= 0:
                     # Get energy cost per kWh from settings (default to 0.15)
-                    from backend.app.api.routes.settings import get_setting
-                    energy_cost_per_kwh = await get_setting(db, "energy_cost_per_kwh")
+                    energy_cost_per_kwh = await get_setting_cached(db, "energy_cost_per_kwh")
                     cost_per_kwh = float(energy_cost_per_kwh) if energy_cost_per_kwh else 0.15
                     energy_cost = round(energy_used * cost_per_kwh, 2)
 
-                    # Update archive with energy data
-                    from backend.app.models.archive import PrintArchive
-                    result = await db.execute(
-                        select(PrintArchive).where(PrintArchive.id == archive_id)
-                    )
-                    archive = result.scalar_one_or_none()
+                    # Update archive with energy data (saved with the finish photo)
                     if archive:
-                        archive.energy_kwh = energy_used
-                        archive.energy_cost = energy_cost
-                        await db.commit()
-                        logger.info(f"[ENERGY] Saved to archive {archive_id}: {energy_used} kWh, cost={energy_cost}")
+                        archive_changes["energy_kwh"] = energy_used
+                        archive_changes["energy_cost"] = energy_cost
+                        logger.info(f"[ENERGY] Saving to archive {archive_id}: {energy_used} kWh, cost={energy_cost}")
                     else:
                         logger.warning(f"[ENERGY] Archive {archive_id} not found when saving energy")
             else:
                 logger.info(f"[ENERGY] No smart plug found for printer {printer_id} at print complete")
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Failed to calculate energy: {e}")
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Failed to calculate energy: {e}")
 
-    # Capture finish photo from printer camera
-    logger.info(f"[PHOTO] Starting finish photo capture for archive {archive_id}")
-    try:
-        async with async_session() as db:
+        # Capture finish photo from printer camera
+        logger.info(f"[PHOTO] Starting finish photo capture for archive {archive_id}")
+        try:
             # Check if finish photo capture is enabled
-            from backend.app.api.routes.settings import get_setting
-            capture_enabled = await get_setting(db, "capture_finish_photo")
+            capture_enabled = await get_setting_cached(db, "capture_finish_photo")
             logger.info(f"[PHOTO] capture_finish_photo setting: {capture_enabled}")
             if capture_enabled is None or capture_enabled.lower() == "true":
-                # Get printer details
-                from backend.app.models.printer import Printer
-                result = await db.execute(
-                    select(Printer).where(Printer.id == printer_id)
-                )
-                printer = result.scalar_one_or_none()
-
-                if printer and archive_id:
-                    # Get archive to find its directory
-                    from backend.app.models.archive import PrintArchive
-                    result = await db.execute(
-                        select(PrintArchive).where(PrintArchive.id == archive_id)
+                if printer and archive:
+                    from backend.app.services.camera import capture_finish_photo
+
+                    archive_dir = app_settings.base_dir / Path(archive.file_path).parent
+                    photo_filename = await capture_finish_photo(
+                        printer_id=printer_id,
+                        ip_address=printer.ip_address,
+                        access_code=printer.access_code,
+                        model=printer.model,
+                        archive_dir=archive_dir,
                     )
-                    archive = result.scalar_one_or_none()
 
-                    if archive:
-                        from backend.app.services.camera import capture_finish_photo
-                        from pathlib import Path
-
-                        archive_dir = app_settings.base_dir / Path(archive.file_path).parent
-                        photo_filename = await capture_finish_photo(
-                            printer_id=printer_id,
-                            ip_address=printer.ip_address,
-                            access_code=printer.access_code,
-                            model=printer.model,
-                            archive_dir=archive_dir,
-                        )
-
-                        if photo_filename:
-                            # Add photo to archive's photos list
-                            photos = archive.photos or []
-                            photos.append(photo_filename)
-                            archive.photos = photos
-                            await db.commit()
-                            logger.info(f"Added finish photo to archive {archive_id}: {photo_filename}")
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Finish photo capture failed: {e}")
+                    if photo_filename:
+                        # Append to the archive's photos list in SQL rather than
+                        # rewriting the whole JSON array from Python
+                        archive_changes["photos"] = ArchiveService.append_photo_expr(photo_filename)
+                        logger.info(f"Added finish photo to archive {archive_id}: {photo_filename}")
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Finish photo capture failed: {e}")
 
-    # Smart plug automation: schedule turn off when print completes
-    logger.info(f"[AUTO-OFF] Calling smart_plug_manager.on_print_complete for printer {printer_id}")
-    try:
-        async with async_session() as db:
-            status = data.get("status", "completed")
+        # Persist the energy and photo updates in one statement
+        if archive_changes:
+            try:
+                await db.execute(
+                    update(PrintArchive)
+                    .where(PrintArchive.id == archive_id)
+                    .values(**archive_changes)
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"Failed to save energy/photo for archive {archive_id}: {e}")
+
+        # Smart plug automation: schedule turn off when print completes
+        logger.info(f"[AUTO-OFF] Calling smart_plug_manager.on_print_complete for printer {printer_id}")
+        try:
             await smart_plug_manager.on_print_complete(printer_id, status, db)
             logger.info(f"[AUTO-OFF] smart_plug_manager.on_print_complete completed")
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Smart plug on_print_complete failed: {e}")
-
-    # Send print complete notifications
-    try:
-        async with async_session() as db:
-            from backend.app.models.printer import Printer
-            result = await db.execute(
-                select(Printer).where(Printer.id == printer_id)
-            )
-            printer = result.scalar_one_or_none()
-            printer_name = printer.name if printer else f"Printer {printer_id}"
-            status = data.get("status", "completed")
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Smart plug on_print_complete failed: {e}")
 
+        # Send print complete notifications
+        try:
             # on_print_complete handles all status types: completed, failed, aborted, stopped
             await notification_service.on_print_complete(
                 printer_id, printer_name, status, data, db
             )
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Notification on_print_complete failed: {e}")
-
-    # Check for maintenance due and send notifications (only for completed prints)
-    if data.get("status") == "completed":
-        try:
-            async with async_session() as db:
-                from backend.app.models.printer import Printer
-
-                # Get printer name
-                result = await db.execute(
-                    select(Printer).where(Printer.id == printer_id)
-                )
-                printer = result.scalar_one_or_none()
-                printer_name = printer.name if printer else f"Printer {printer_id}"
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Notification on_print_complete failed: {e}")
 
+        # Check for maintenance due and send notifications (only for completed prints)
+        if data.get("status") == "completed":
+            try:
                 # Get maintenance overview for this printer
                 await ensure_default_types(db)
                 overview = await _get_printer_maintenance_internal(printer_id, db, commit=True)
@@ -901,13 +806,12 @@ async def on_print_complete(printer_id: int, data: dict):
                         f"Sent maintenance notification for printer {printer_id}: "
                         f"{len(items_needing_attention)} items need attention"
                     )
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"Maintenance notification check failed: {e}")
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"Maintenance notification check failed: {e}")
 
-    # Update queue item if this was a scheduled print
-    try:
-        async with async_session() as db:
+        # Update queue item if this was a scheduled print
+        try:
             from backend.app.models.print_queue import PrintQueueItem
             # Note: SmartPlug is already imported at module level (line 56)
             # Do NOT import it here as it would shadow the module-level import
@@ -920,50 +824,48 @@ async def on_print_complete(printer_id: int, data: dict):
             )
             queue_item = result.scalar_one_or_none()
             if queue_item:
-                status = data.get("status", "completed")
                 queue_item.status = status
                 queue_item.completed_at = datetime.now()
                 await db.commit()
                 logger.info(f"Updated queue item {queue_item.id} status to {status}")
 
                 # Handle auto_off_after - power off printer if requested (after cooldown)
-                if queue_item.auto_off_after:
-                    result = await db.execute(
-                        select(SmartPlug).where(SmartPlug.printer_id == printer_id)
-                    )
-                    plug = result.scalar_one_or_none()
-                    if plug and plug.enabled:
-                        logger.info(f"Auto-off requested for printer {printer_id}, waiting for cooldown...")
-
-                        async def cooldown_and_poweroff(pid: int, plug_id: int):
-                            # Wait for nozzle to cool down
-                            await printer_manager.wait_for_cooldown(pid, target_temp=50.0, timeout=600)
-                            # Re-fetch plug in new session
-                            async with async_session() as new_db:
-                                result = await new_db.execute(
-                                    select(SmartPlug).where(SmartPlug.id == plug_id)
-                                )
-                                p = result.scalar_one_or_none()
-                                if p and p.enabled:
-                                    success = await tasmota_service.turn_off(p)
-                                    if success:
-                                        logger.info(f"Powered off printer {pid} via smart plug '{p.name}'")
-                                    else:
-                                        logger.warning(f"Failed to power off printer {pid} via smart plug")
-
-                        asyncio.create_task(cooldown_and_poweroff(printer_id, plug.id))
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Queue item update failed: {e}")
+                if queue_item.auto_off_after and plug and plug.enabled:
+                    logger.info(f"Auto-off requested for printer {printer_id}, waiting for cooldown...")
+
+                    async def cooldown_and_poweroff(pid: int, plug_id: int):
+                        # Wait for nozzle to cool down
+                        await printer_manager.wait_for_cooldown(pid, target_temp=50.0, timeout=600)
+                        # Re-fetch plug in new session
+                        async with async_session() as new_db:
+                            result = await new_db.execute(
+                                select(SmartPlug).where(SmartPlug.id == plug_id)
+                            )
+                            p = result.scalar_one_or_none()
+                            if p and p.enabled:
+                                success = await tasmota_service.turn_off(p)
+                                if success:
+                                    logger.info(f"Powered off printer {pid} via smart plug '{p.name}'")
+                                else:
+                                    logger.warning(f"Failed to power off printer {pid} via smart plug")
+
+                    asyncio.create_task(cooldown_and_poweroff(printer_id, plug.id))
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Queue item update failed: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await init_db()
+    await warm_statement_cache()
+    (app_settings.archive_dir / "temp").mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread(printers.prune_cover_cache)
+    _load_index_html()
 
     # Set up printer manager callbacks
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     printer_manager.set_event_loop(loop)
     printer_manager.set_status_change_callback(on_printer_status_change)
     printer_manager.set_print_start_callback(on_print_start)
@@ -1039,12 +941,31 @@ if app_settings.static_dir.exists() and any(app_settings.static_dir.iterdir()):
         )
 
 
-@app.get("/")
-async def serve_frontend():
-    """Serve the React frontend."""
+# Built frontend index.html as (body, etag), loaded once at startup
+_index_html: tuple[bytes, str] | None = None
+
+
+def _load_index_html() -> None:
+    global _index_html
     index_file = app_settings.static_dir / "index.html"
     if index_file.exists():
-        return FileResponse(index_file)
+        body = index_file.read_bytes()
+        _index_html = (body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+
+def _index_response(request: Request) -> Response:
+    body, etag = _index_html
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="text/html", headers=headers)
+
+
+@app.get("/")
+async def serve_frontend(request: Request):
+    """Serve the React frontend."""
+    if _index_html:
+        return _index_response(request)
     return {
         "message": "BambuTrack API",
         "docs": "/docs",
@@ -1060,14 +981,13 @@ async def health_check():
 
 # Catch-all route for React Router (must be last)
 @app.get("/{full_path:path}")
-async def serve_spa(full_path: str):
+async def serve_spa(request: Request, full_path: str):
     """Serve React app for client-side routing."""
-    # Don't intercept API routes
+    # Unmatched API paths end up here too; give them a real 404, not the SPA
     if full_path.startswith("api/"):
-        return {"error": "Not found"}
+        raise HTTPException(404, "Not found")
 
-    index_file = app_settings.static_dir / "index.html"
-    if index_file.exists():
-        return FileResponse(index_file)
+    if _index_html:
+        return _index_response(request)
 
     return {"error": "Frontend not built"}
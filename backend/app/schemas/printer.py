@@ -1,11 +1,24 @@
+import ipaddress
 from datetime import datetime
-from pydantic import BaseModel, Field
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+
+
+def _validate_ipv4(value: str) -> str:
+    # ipaddress raises ValueError, which pydantic reports as a validation error
+    ipaddress.IPv4Address(value)
+    return value
+
+
+# Dotted-quad IPv4 address, kept as a string for storage
+IPv4Str = Annotated[str, AfterValidator(_validate_ipv4)]
 
 
 class PrinterBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     serial_number: str = Field(..., min_length=1, max_length=50)
-    ip_address: str = Field(..., pattern=r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$")
+    ip_address: IPv4Str
     access_code: str = Field(..., min_length=1, max_length=20)
     model: str | None = None
     auto_archive: bool = True
@@ -27,14 +40,14 @@ class PrinterUpdate(BaseModel):
 
 class PrinterResponse(PrinterBase):
     id: int
+    ip_address: str  # Not re-validated, so rows saved before stricter checks still load
     is_active: bool
     nozzle_count: int = 1  # 1 or 2, auto-detected from MQTT
     print_hours_offset: float = 0.0
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class HMSErrorResponse(BaseModel):
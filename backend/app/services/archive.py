@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 import json
 import zipfile
@@ -7,7 +8,7 @@ from pathlib import Path
 from xml.etree import ElementTree as ET
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import String, select, and_, or_, func, literal
 
 from backend.app.core.config import settings
 from backend.app.models.archive import PrintArchive
@@ -514,6 +515,20 @@ class ArchiveService:
                 sha256.update(chunk)
         return sha256.hexdigest()
 
+    @staticmethod
+    def append_photo_expr(photo_filename: str):
+        """SQL expression appending a filename to PrintArchive.photos.
+
+        The column may hold SQL NULL or the JSON text 'null', both of which
+        are treated as an empty list.
+        """
+        current = func.nullif(PrintArchive.photos, literal("null", String))
+        return func.json_insert(
+            func.coalesce(current, func.json_array()),
+            "$[#]",
+            photo_filename,
+        )
+
     async def get_duplicate_hashes(self) -> set[str]:
         """Get all content hashes that appear more than once.
 
@@ -603,14 +618,16 @@ class ArchiveService:
         printer_id: int | None,
         source_file: Path,
         print_data: dict | None = None,
+        move_source: bool = False,
     ) -> PrintArchive | None:
-        """Archive a 3MF file with metadata."""
+        """Archive a 3MF file with metadata.
+
+        With move_source the file is moved into the archive instead of copied,
+        for callers that downloaded it to a scratch location.
+        """
         # Verify printer exists if specified
         if printer_id is not None:
-            result = await self.db.execute(
-                select(Printer).where(Printer.id == printer_id)
-            )
-            printer = result.scalar_one_or_none()
+            printer = await self.db.get(Printer, printer_id)
             if not printer:
                 return None
 
@@ -620,24 +637,29 @@ class ArchiveService:
         # Use "unassigned" folder for archives without a printer
         printer_folder = str(printer_id) if printer_id is not None else "unassigned"
         archive_dir = settings.archive_dir / printer_folder / archive_name
-        archive_dir.mkdir(parents=True, exist_ok=True)
-
-        # Copy 3MF file
         dest_file = archive_dir / source_file.name
-        shutil.copy2(source_file, dest_file)
 
-        # Compute content hash for duplicate detection
-        content_hash = self.compute_file_hash(dest_file)
+        # Store 3MF file and compute content hash for duplicate detection.
+        # 3MF files can be tens of MB, so keep the disk I/O off the event loop.
+        def _store():
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            if move_source:
+                shutil.move(source_file, dest_file)
+            else:
+                shutil.copy2(source_file, dest_file)
+            return self.compute_file_hash(dest_file)
+
+        content_hash = await asyncio.to_thread(_store)
 
         # Parse 3MF metadata
         parser = ThreeMFParser(dest_file)
-        metadata = parser.parse()
+        metadata = await asyncio.to_thread(parser.parse)
 
         # Save thumbnail if present
         thumbnail_path = None
         if "_thumbnail_data" in metadata:
             thumb_file = archive_dir / f"thumbnail{metadata['_thumbnail_ext']}"
-            thumb_file.write_bytes(metadata["_thumbnail_data"])
+            await asyncio.to_thread(thumb_file.write_bytes, metadata["_thumbnail_data"])
             thumbnail_path = str(thumb_file.relative_to(settings.base_dir))
             del metadata["_thumbnail_data"]
             del metadata["_thumbnail_ext"]
@@ -2,9 +2,12 @@ import ssl
 import socket
 import asyncio
 import logging
-from ftplib import FTP_TLS, FTP
+import zipfile
+from collections.abc import AsyncIterator, Callable
+from ftplib import FTP_TLS, FTP, error_temp
 from pathlib import Path
-from io import BytesIO
+from io import BytesIO, RawIOBase, SEEK_SET, SEEK_CUR, SEEK_END
+from typing import TypeVar
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +58,25 @@ class ImplicitFTP_TLS(FTP_TLS):
         return conn, size
 
 
+T = TypeVar("T")
+
+# Directory a "try paths" lookup last succeeded in, per printer IP. Printers
+# keep jobs in a fixed location (e.g. / or /cache), so trying it first turns
+# repeated lookups into a single probe instead of walking every candidate.
+_found_dirs: dict[str, str] = {}
+
+
+def _prefer_found_dir(ip_address: str, remote_paths: list[str]) -> list[str]:
+    """Order candidate paths so the directory that last matched comes first."""
+    found_dir = _found_dirs.get(ip_address)
+    if found_dir is None:
+        return remote_paths
+    return sorted(remote_paths, key=lambda p: p.rpartition("/")[0] != found_dir)
+
+
+def _remember_found_dir(ip_address: str, remote_path: str) -> None:
+    _found_dirs[ip_address] = remote_path.rpartition("/")[0]
+
 
 class BambuFTPClient:
     """FTP client for retrieving files from Bambu Lab printers."""
@@ -158,6 +180,53 @@ class BambuFTPClient:
         except Exception:
             return None
 
+    def download_range(self, remote_path: str, offset: int, length: int) -> bytes | None:
+        """Download up to length bytes of a file starting at offset (REST + RETR)."""
+        if not self._ftp:
+            return None
+
+        try:
+            self._ftp.voidcmd("TYPE I")
+            chunks = []
+            remaining = length
+            with self._ftp.transfercmd(f"RETR {remote_path}", rest=offset) as conn:
+                while remaining > 0:
+                    chunk = conn.recv(min(remaining, 65536))
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+            # 226 if the whole remainder was sent, 426 if we closed the transfer early
+            try:
+                self._ftp.voidresp()
+            except error_temp:
+                pass
+            return b"".join(chunks)
+        except Exception as e:
+            logger.debug(f"Failed to download range of {remote_path}: {e}")
+            return None
+
+    def open_download(self, remote_path: str) -> socket.socket | None:
+        """Start a binary RETR and return the data connection to read from."""
+        if not self._ftp:
+            return None
+
+        try:
+            self._ftp.voidcmd("TYPE I")
+            return self._ftp.transfercmd(f"RETR {remote_path}")
+        except Exception as e:
+            logger.debug(f"Failed to open {remote_path} for download: {e}")
+            return None
+
+    def close_download(self, conn: socket.socket) -> None:
+        """Close a data connection from open_download and read the transfer reply."""
+        conn.close()
+        if self._ftp:
+            try:
+                self._ftp.voidresp()
+            except Exception:
+                pass
+
     def download_to_file(self, remote_path: str, local_path: Path) -> bool:
         """Download a file from the printer to local filesystem."""
         if not self._ftp:
@@ -227,6 +296,8 @@ class BambuFTPClient:
             return None
 
         try:
+            # SIZE is only reliable in binary mode
+            self._ftp.voidcmd("TYPE I")
             return self._ftp.size(remote_path)
         except Exception:
             return None
@@ -277,6 +348,68 @@ class BambuFTPClient:
         return result if result else None
 
 
+class FTPRangeFile(RawIOBase):
+    """Read-only, seekable file object backed by ranged FTP downloads.
+
+    Lets zipfile parse a remote 3MF by fetching only the central directory
+    and the members it reads, instead of the whole archive.
+    """
+
+    BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, client: BambuFTPClient, remote_path: str, size: int):
+        self._client = client
+        self._remote_path = remote_path
+        self._size = size
+        self._pos = 0
+        self._buf_start = 0
+        self._buf = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if whence == SEEK_CUR:
+            offset += self._pos
+        elif whence == SEEK_END:
+            offset += self._size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def read(self, n: int = -1) -> bytes:
+        if n is None or n < 0:
+            n = self._size - self._pos
+        n = min(n, self._size - self._pos)
+        if n <= 0:
+            return b""
+
+        end = self._pos + n
+        if not (self._buf_start <= self._pos and end <= self._buf_start + len(self._buf)):
+            # Fetch at least a block; near the end of the file fetch the whole
+            # tail so the end-of-central-directory and central directory arrive together
+            start = self._pos
+            length = max(n, self.BLOCK_SIZE)
+            if start + length > self._size:
+                start = max(0, self._size - length)
+                length = self._size - start
+            data = self._client.download_range(self._remote_path, start, length)
+            if not data:
+                raise OSError(f"Failed to read {self._remote_path} at offset {start}")
+            self._buf_start = start
+            self._buf = data
+
+        offset = self._pos - self._buf_start
+        data = self._buf[offset:offset + n]
+        self._pos += len(data)
+        return data
+
+
 async def download_file_async(
     ip_address: str,
     access_code: str,
@@ -284,7 +417,7 @@ async def download_file_async(
     local_path: Path,
 ) -> bool:
     """Async wrapper for downloading a file."""
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
 
     def _download():
         client = BambuFTPClient(ip_address, access_code)
@@ -305,7 +438,7 @@ async def download_file_try_paths_async(
     local_path: Path,
 ) -> bool:
     """Try downloading a file from multiple paths using a single connection."""
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
 
     def _download():
         client = BambuFTPClient(ip_address, access_code)
@@ -313,8 +446,9 @@ async def download_file_try_paths_async(
             return False
 
         try:
-            for remote_path in remote_paths:
+            for remote_path in _prefer_found_dir(ip_address, remote_paths):
                 if client.download_to_file(remote_path, local_path):
+                    _remember_found_dir(ip_address, remote_path)
                     return True
             return False
         finally:
@@ -323,6 +457,121 @@ async def download_file_try_paths_async(
     return await loop.run_in_executor(None, _download)
 
 
+async def download_first_existing_async(
+    ip_address: str,
+    access_code: str,
+    names: list[str],
+    directories: list[str],
+    local_dir: Path,
+) -> str | None:
+    """Download the first of several candidate files that exists on the printer.
+
+    Names are tried in priority order, each in every directory, checking
+    existence with SIZE so only the winning file is transferred. Returns the
+    downloaded filename (saved as local_dir / filename), or None.
+    """
+    loop = asyncio.get_running_loop()
+
+    def _download():
+        client = BambuFTPClient(ip_address, access_code)
+        if not client.connect():
+            return None
+
+        try:
+            for name in names:
+                remote_paths = [directory + name for directory in directories]
+                for remote_path in _prefer_found_dir(ip_address, remote_paths):
+                    if not client.get_file_size(remote_path):
+                        continue
+                    if client.download_to_file(remote_path, local_dir / name):
+                        _remember_found_dir(ip_address, remote_path)
+                        return name
+            return None
+        finally:
+            client.disconnect()
+
+    return await loop.run_in_executor(None, _download)
+
+
+async def download_matching_file_async(
+    ip_address: str,
+    access_code: str,
+    directory: str,
+    match: Callable[[str], bool],
+    local_dir: Path,
+) -> str | None:
+    """List a directory and download the first file whose name matches.
+
+    Listing and download share one connection. Returns the downloaded
+    filename (saved as local_dir / filename), or None if nothing matched.
+    """
+    loop = asyncio.get_running_loop()
+
+    def _download():
+        client = BambuFTPClient(ip_address, access_code)
+        if not client.connect():
+            return None
+
+        try:
+            for f in client.list_files(directory):
+                name = f["name"]
+                if f["is_directory"] or not match(name):
+                    continue
+                if client.download_to_file(f["path"], local_dir / name):
+                    return name
+            return None
+        finally:
+            client.disconnect()
+
+    return await loop.run_in_executor(None, _download)
+
+
+async def read_zip_try_paths_async(
+    ip_address: str,
+    access_code: str,
+    remote_paths: list[str],
+    extract: Callable[[zipfile.ZipFile], T],
+) -> T | None:
+    """Open a ZIP/3MF from the first existing path and run extract on it.
+
+    Only the byte ranges zipfile actually reads are transferred. Falls back to
+    downloading the whole file if the server doesn't support ranged reads.
+    """
+    loop = asyncio.get_running_loop()
+
+    def _read():
+        client = BambuFTPClient(ip_address, access_code)
+        if not client.connect():
+            return None
+
+        try:
+            for remote_path in _prefer_found_dir(ip_address, remote_paths):
+                size = client.get_file_size(remote_path)
+                if not size:
+                    continue
+
+                try:
+                    with zipfile.ZipFile(FTPRangeFile(client, remote_path, size)) as zf:
+                        result = extract(zf)
+                    _remember_found_dir(ip_address, remote_path)
+                    return result
+                except (OSError, zipfile.BadZipFile) as e:
+                    logger.debug(f"Ranged read of {remote_path} failed, downloading whole file: {e}")
+
+                data = client.download_file(remote_path)
+                if not data:
+                    continue
+                with zipfile.ZipFile(BytesIO(data)) as zf:
+                    result = extract(zf)
+                _remember_found_dir(ip_address, remote_path)
+                return result
+            return None
+        finally:
+            client.disconnect()
+
+    return await loop.run_in_executor(None, _read)
+
+
 async def upload_file_async(
     ip_address: str,
     access_code: str,
@@ -330,7 +579,7 @@ async def upload_file_async(
     remote_path: str,
 ) -> bool:
     """Async wrapper for uploading a file."""
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
 
     def _upload():
         logger.info(f"FTP connecting to {ip_address} for upload...")
@@ -353,7 +602,7 @@ async def list_files_async(
     path: str = "/",
 ) -> list[dict]:
     """Async wrapper for listing files."""
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
 
     def _list():
         client = BambuFTPClient(ip_address, access_code)
@@ -373,7 +622,7 @@ async def delete_file_async(
     remote_path: str,
 ) -> bool:
     """Async wrapper for deleting a file."""
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
 
     def _delete():
         client = BambuFTPClient(ip_address, access_code)
@@ -393,7 +642,7 @@ async def download_file_bytes_async(
     remote_path: str,
 ) -> bytes | None:
     """Async wrapper for downloading file as bytes."""
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
 
     def _download():
         client = BambuFTPClient(ip_address, access_code)
@@ -407,12 +656,55 @@ async def download_file_bytes_async(
     return await loop.run_in_executor(None, _download)
 
 
+async def open_file_stream_async(
+    ip_address: str,
+    access_code: str,
+    remote_path: str,
+    chunk_size: int = 64 * 1024,
+) -> AsyncIterator[bytes] | None:
+    """Start downloading a file and return an async iterator over its chunks.
+
+    Returns None if the file can't be opened. The FTP connection is closed
+    once the iterator is exhausted or closed.
+    """
+    loop = asyncio.get_running_loop()
+    client = BambuFTPClient(ip_address, access_code)
+
+    def _open():
+        if not client.connect():
+            return None
+        conn = client.open_download(remote_path)
+        if conn is None:
+            client.disconnect()
+        return conn
+
+    conn = await loop.run_in_executor(None, _open)
+    if conn is None:
+        return None
+
+    def _close():
+        client.close_download(conn)
+        client.disconnect()
+
+    async def _chunks():
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, conn.recv, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await loop.run_in_executor(None, _close)
+
+    return _chunks()
+
+
 async def get_storage_info_async(
     ip_address: str,
     access_code: str,
 ) -> dict | None:
     """Async wrapper for getting storage info."""
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
 
     def _get_storage():
         client = BambuFTPClient(ip_address, access_code)
@@ -1,4 +1,3 @@
-import json
 import ssl
 import asyncio
 import logging
@@ -8,21 +7,83 @@ from datetime import datetime
 from typing import Callable
 from dataclasses import dataclass, field
 
+import orjson
 import paho.mqtt.client as mqtt
 
-logger = logging.getLogger(__name__)
+# ssrjson (optional) decodes the large status reports faster on x86-64
+try:
+    from ssrjson import loads as json_loads
+except ImportError:
+    from orjson import loads as json_loads
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Fixed commands, serialized once
+_PUSHALL_COMMAND = orjson.dumps({"pushing": {"command": "pushall"}})
+_STOP_PRINT_COMMAND = orjson.dumps({"print": {"command": "stop", "sequence_id": "0"}})
+
+
+def _noop(*args) -> None:
+    """Stand-in for callbacks that weren't provided."""
+
+
+# "print" report keys copied onto PrinterState: key -> (attribute, converter)
+_STATE_FIELDS: dict[str, tuple[str, Callable | None]] = {
+    "gcode_state": ("state", None),
+    "subtask_id": ("subtask_id", None),
+    "mc_percent": ("progress", float),
+    "mc_remaining_time": ("remaining_time", int),
+    "layer_num": ("layer_num", int),
+    "total_layer_num": ("total_layers", int),
+}
+
+# Temperature report keys -> PrinterState.temperatures key
+_TEMP_FIELDS: dict[str, str] = {
+    "bed_temper": "bed",
+    "bed_target_temper": "bed_target",
+    "nozzle_temper": "nozzle",
+    "nozzle_target_temper": "nozzle_target",
+    "chamber_temper": "chamber",
+    # Second nozzle for dual-extruder printers (H2 series); field names
+    # differ between firmware versions
+    "nozzle_temper_2": "nozzle_2",
+    "nozzle_target_temper_2": "nozzle_2_target",
+    "right_nozzle_temper": "nozzle_2",
+    "right_nozzle_target_temper": "nozzle_2_target",
+    # Some H2 models report the left nozzle as the primary one
+    "left_nozzle_temper": "nozzle",
+    "left_nozzle_target_temper": "nozzle_target",
+}
+
+# Alternative names above -> the main field that takes precedence over them
+_TEMP_FALLBACK_FIELDS: dict[str, str] = {
+    "right_nozzle_temper": "nozzle_temper_2",
+    "right_nozzle_target_temper": "nozzle_target_temper_2",
+    "left_nozzle_temper": "nozzle_temper",
+    "left_nozzle_target_temper": "nozzle_target_temper",
+}
+
+# Keys of the small incremental pushes that only report print progress
+_HEARTBEAT_KEYS = frozenset({
+    "mc_percent",
+    "mc_remaining_time",
+    "layer_num",
+    "command",
+    "msg",
+    "sequence_id",
+})
+
+
+@dataclass(slots=True)
 class MQTTLogEntry:
     """Log entry for MQTT message debugging."""
     timestamp: str
     topic: str
     direction: str  # "in" or "out"
-    payload: dict
+    payload: orjson.Fragment  # Raw JSON as received/sent, embedded as-is by orjson.dumps
 
 
-@dataclass
+@dataclass(slots=True)
 class HMSError:
     """Health Management System error from printer."""
     code: str
@@ -47,7 +108,7 @@ class KProfile:
     setting_id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PrinterState:
     connected: bool = False
     state: str = "unknown"
@@ -69,6 +130,8 @@ class BambuMQTTClient:
     """MQTT client for Bambu Lab printer communication."""
 
     MQTT_PORT = 8883
+    RECONNECT_MIN_DELAY = 1.0
+    RECONNECT_MAX_DELAY = 120.0
 
     def __init__(
         self,
@@ -83,36 +146,36 @@ class BambuMQTTClient:
         self.ip_address = ip_address
         self.serial_number = serial_number
         self.access_code = access_code
-        self.on_state_change = on_state_change
-        self.on_print_start = on_print_start
-        self.on_print_complete = on_print_complete
-        self.on_ams_change = on_ams_change
+        # Unset callbacks become no-ops, so the message path can call them unconditionally
+        self.on_state_change = on_state_change or _noop
+        self.on_print_start = on_print_start or _noop
+        self.on_print_complete = on_print_complete or _noop
+        self.on_ams_change = on_ams_change or _noop
+        self.topic_subscribe = f"device/{serial_number}/report"
+        self.topic_publish = f"device/{serial_number}/request"
 
         self.state = PrinterState()
         self._client: mqtt.Client | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._network_task: asyncio.Task | None = None
+        self._connecting: bool = False  # A reconnect() is running in a worker thread
         self._previous_gcode_state: str | None = None
         self._previous_gcode_file: str | None = None
         self._was_running: bool = False  # Track if we've seen RUNNING state for current print
         self._completion_triggered: bool = False  # Prevent duplicate completion triggers
-        self._message_log: deque[MQTTLogEntry] = deque(maxlen=100)
+        # Raw (time_ns, topic, direction, payload bytes); formatted in get_logs()
+        self._message_log: deque[tuple[int, str, str, bytes]] = deque(maxlen=100)
         self._logging_enabled: bool = False
+        self._connection_changed: bool = False  # connected flipped since the last state callback
         self._last_message_time: float = 0.0  # Track when we last received a message
         self._previous_ams_hash: str | None = None  # Track AMS changes
+        self._last_hms_codes: tuple | None = None  # HMS codes behind state.hms_errors
 
         # K-profile command tracking
         self._sequence_id: int = 0
         self._pending_kprofile_response: asyncio.Event | None = None
         self._kprofile_response_data: list | None = None
 
-    @property
-    def topic_subscribe(self) -> str:
-        return f"device/{self.serial_number}/report"
-
-    @property
-    def topic_publish(self) -> str:
-        return f"device/{self.serial_number}/request"
-
     def _on_connect(self, client, userdata, flags, rc, properties=None):
         if rc == 0:
             self.state.connected = True
@@ -122,8 +185,7 @@ class BambuMQTTClient:
             # Prime K-profile request (Bambu printers often ignore first request)
             self._prime_kprofile_request()
             # Immediately broadcast connection state change
-            if self.on_state_change:
-                self.on_state_change(self.state)
+            self.on_state_change(self.state)
         else:
             self.state.connected = False
 
@@ -139,26 +201,23 @@ class BambuMQTTClient:
 
         logger.warning(f"[{self.serial_number}] MQTT disconnected: rc={rc}, flags={disconnect_flags}")
         self.state.connected = False
-        if self.on_state_change:
-            self.on_state_change(self.state)
+        self.on_state_change(self.state)
 
     def _on_message(self, client, userdata, msg):
         try:
-            payload = json.loads(msg.payload.decode())
-            # Track last message time - receiving a message proves we're connected
-            self._last_message_time = time.time()
+            # Parse the raw bytes directly, no separate UTF-8 decode pass
+            payload = json_loads(msg.payload)
+        except ValueError:  # JSONDecodeError of either decoder
+            return
+        # Track last message time - receiving a message proves we're connected
+        self._last_message_time = time.time()
+        if not self.state.connected:
             self.state.connected = True
-            # Log message if logging is enabled
-            if self._logging_enabled:
-                self._message_log.append(MQTTLogEntry(
-                    timestamp=datetime.now().isoformat(),
-                    topic=msg.topic,
-                    direction="in",
-                    payload=payload,
-                ))
-            self._process_message(payload)
-        except json.JSONDecodeError:
-            pass
+            self._connection_changed = True
+        # Log message if logging is enabled
+        if self._logging_enabled:
+            self._message_log.append((time.time_ns(), msg.topic, "in", msg.payload))
+        self._process_message(payload)
 
     def _process_message(self, payload: dict):
         """Process incoming MQTT message from printer."""
@@ -215,17 +274,84 @@ class BambuMQTTClient:
         # Only trigger callback if AMS data actually changed
         if ams_hash != self._previous_ams_hash:
             self._previous_ams_hash = ams_hash
-            if self.on_ams_change:
-                logger.info(f"[{self.serial_number}] AMS data changed, triggering sync callback")
-                self.on_ams_change(ams_data)
+            logger.info(f"[{self.serial_number}] AMS data changed, triggering sync callback")
+            self.on_ams_change(ams_data)
+
+    def _set_raw_data(self, data: dict):
+        # Preserve AMS data when updating raw_data (AMS comes at top level, not in print)
+        ams_data = self.state.raw_data.get("ams")
+        self.state.raw_data = data
+        if ams_data is not None:
+            self.state.raw_data["ams"] = ams_data
+
+    def _update_heartbeat(self, data: dict):
+        """Update printer state from a progress-only push (see _HEARTBEAT_KEYS)."""
+        state = self.state
+        dirty = self._connection_changed
+        self._connection_changed = False
+
+        if "mc_percent" in data:
+            progress = float(data["mc_percent"])
+            if progress != state.progress:
+                state.progress = progress
+                dirty = True
+        if "mc_remaining_time" in data:
+            remaining_time = int(data["mc_remaining_time"])
+            if remaining_time != state.remaining_time:
+                state.remaining_time = remaining_time
+                dirty = True
+        if "layer_num" in data:
+            layer_num = int(data["layer_num"])
+            if layer_num != state.layer_num:
+                state.layer_num = layer_num
+                dirty = True
+
+        self._set_raw_data(data)
+        if dirty:
+            self.on_state_change(state)
 
     def _update_state(self, data: dict):
         """Update printer state from message data."""
-        previous_state = self.state.state
+        # Most pushes during a print only carry progress. Without a state or
+        # file change they can't start or finish a print, so skip the full update.
+        if data.keys() <= _HEARTBEAT_KEYS:
+            self._update_heartbeat(data)
+            return
 
-        # Update state fields
-        if "gcode_state" in data:
-            self.state.state = data["gcode_state"]
+        # Printers push the same values several times per second, so track
+        # whether anything actually changed before notifying on_state_change
+        dirty = self._connection_changed
+        self._connection_changed = False
+
+        # Update state and temperature fields in a single pass over the report.
+        # Temperatures are updated in place: incremental pushes often carry only
+        # some of them, and the last known values (e.g. targets) stay valid.
+        temps = self.state.temperatures
+        has_temps = False
+        for key, value in data.items():
+            spec = _STATE_FIELDS.get(key)
+            if spec is not None:
+                attr, convert = spec
+                if convert:
+                    value = convert(value)
+                if getattr(self.state, attr) != value:
+                    setattr(self.state, attr, value)
+                    dirty = True
+                continue
+            temp_key = _TEMP_FIELDS.get(key)
+            if temp_key is not None:
+                has_temps = True
+                main_key = _TEMP_FALLBACK_FIELDS.get(key)
+                if main_key is None or main_key not in data:
+                    # JSON decoders already return floats for most readings;
+                    # whole numbers (e.g. targets) still arrive as int
+                    if type(value) is not float:
+                        value = float(value)
+                    if temps.get(temp_key) != value:
+                        temps[temp_key] = value
+                        dirty = True
+
+        previous_print = (self.state.gcode_file, self.state.subtask_name, self.state.current_print)
         if "gcode_file" in data:
             self.state.gcode_file = data["gcode_file"]
             self.state.current_print = data["gcode_file"]
@@ -234,83 +360,53 @@ class BambuMQTTClient:
             # Prefer subtask_name as current_print if available
             if data["subtask_name"]:
                 self.state.current_print = data["subtask_name"]
-        if "subtask_id" in data:
-            self.state.subtask_id = data["subtask_id"]
-        if "mc_percent" in data:
-            self.state.progress = float(data["mc_percent"])
-        if "mc_remaining_time" in data:
-            self.state.remaining_time = int(data["mc_remaining_time"])
-        if "layer_num" in data:
-            self.state.layer_num = int(data["layer_num"])
-        if "total_layer_num" in data:
-            self.state.total_layers = int(data["total_layer_num"])
-
-        # Temperature data
-        temps = {}
-        # Log all temperature-related fields for debugging (only when we have temp data)
-        temp_fields = {k: v for k, v in data.items() if 'temp' in k.lower() or 'nozzle' in k.lower()}
-        if temp_fields and not hasattr(self, '_temp_fields_logged'):
+        if (self.state.gcode_file, self.state.subtask_name, self.state.current_print) != previous_print:
+            dirty = True
+
+        # Log all temperature-related fields for debugging (once, when we first have temp data)
+        if has_temps and not hasattr(self, '_temp_fields_logged'):
+            temp_fields = {k: v for k, v in data.items() if 'temp' in k.lower() or 'nozzle' in k.lower()}
             logger.info(f"[{self.serial_number}] Temperature fields in MQTT data: {temp_fields}")
             self._temp_fields_logged = True
-        if "bed_temper" in data:
-            temps["bed"] = float(data["bed_temper"])
-        if "bed_target_temper" in data:
-            temps["bed_target"] = float(data["bed_target_temper"])
-        if "nozzle_temper" in data:
-            temps["nozzle"] = float(data["nozzle_temper"])
-        if "nozzle_target_temper" in data:
-            temps["nozzle_target"] = float(data["nozzle_target_temper"])
-        # Second nozzle for dual-extruder printers (H2 series)
-        # Try multiple possible field names used by different firmware versions
-        if "nozzle_temper_2" in data:
-            temps["nozzle_2"] = float(data["nozzle_temper_2"])
-        elif "right_nozzle_temper" in data:
-            temps["nozzle_2"] = float(data["right_nozzle_temper"])
-        if "nozzle_target_temper_2" in data:
-            temps["nozzle_2_target"] = float(data["nozzle_target_temper_2"])
-        elif "right_nozzle_target_temper" in data:
-            temps["nozzle_2_target"] = float(data["right_nozzle_target_temper"])
-        # Also check for left nozzle as primary (some H2 models)
-        if "left_nozzle_temper" in data and "nozzle" not in temps:
-            temps["nozzle"] = float(data["left_nozzle_temper"])
-        if "left_nozzle_target_temper" in data and "nozzle_target" not in temps:
-            temps["nozzle_target"] = float(data["left_nozzle_target_temper"])
-        if "chamber_temper" in data:
-            temps["chamber"] = float(data["chamber_temper"])
-        if temps:
-            self.state.temperatures = temps
 
         # Parse HMS (Health Management System) errors
         if "hms" in data:
             hms_list = data["hms"]
-            self.state.hms_errors = []
-            if isinstance(hms_list, list):
-                for hms in hms_list:
-                    if isinstance(hms, dict):
-                        # HMS format: {"attr": code, "code": full_code}
-                        # The code is a hex string, severity is in bits
-                        code = hms.get("code", hms.get("attr", "0"))
-                        if isinstance(code, int):
-                            code = hex(code)
-                        # Parse severity from code (typically last 4 bits indicate level)
+            # HMS format: {"attr": code, "code": full_code}
+            # The list rarely changes between pushes, so only re-parse when
+            # the reported codes differ from the last parsed ones
+            hms_codes = tuple(
+                hms.get("code", hms.get("attr", "0"))
+                for hms in (hms_list if isinstance(hms_list, list) else ())
+                if isinstance(hms, dict)
+            )
+            if hms_codes != self._last_hms_codes:
+                self._last_hms_codes = hms_codes
+                hms_errors = []
+                for code in hms_codes:
+                    # The code is usually an int, sometimes a hex string
+                    if isinstance(code, int):
+                        code_int = code
+                        code = hex(code)
+                    else:
+                        code = str(code)
                         try:
-                            code_int = int(str(code).replace("0x", ""), 16) if code else 0
-                            severity = (code_int >> 16) & 0xF  # Extract severity bits
-                            module = (code_int >> 24) & 0xFF  # Extract module bits
-                        except (ValueError, TypeError):
-                            severity = 3
-                            module = 0
-                        self.state.hms_errors.append(HMSError(
-                            code=str(code),
-                            module=module,
-                            severity=severity if severity > 0 else 3,
-                        ))
+                            # int() accepts an optional "0x" prefix in base 16
+                            code_int = int(code, 16) if code else 0
+                        except ValueError:
+                            code_int = 0
+                    severity = (code_int >> 16) & 0xF  # Extract severity bits
+                    module = (code_int >> 24) & 0xFF  # Extract module bits
+                    hms_errors.append(HMSError(
+                        code=code,
+                        module=module,
+                        severity=severity if severity > 0 else 3,
+                    ))
+                if hms_errors != self.state.hms_errors:
+                    self.state.hms_errors[:] = hms_errors
+                    dirty = True
 
-        # Preserve AMS data when updating raw_data (AMS comes at top level, not in print)
-        ams_data = self.state.raw_data.get("ams")
-        self.state.raw_data = data
-        if ams_data is not None:
-            self.state.raw_data["ams"] = ams_data
+        self._set_raw_data(data)
 
         # Log state transitions for debugging
         if "gcode_state" in data:
@@ -343,12 +439,14 @@ class BambuMQTTClient:
 
         if is_new_print or is_file_change:
             # Clear any old HMS errors when a new print starts
-            self.state.hms_errors = []
+            self.state.hms_errors.clear()
+            self._last_hms_codes = None
+            dirty = True
             # Reset completion tracking for new print
             self._was_running = True
             self._completion_triggered = False
 
-        if (is_new_print or is_file_change) and self.on_print_start:
+        if is_new_print or is_file_change:
             logger.info(
                 f"[{self.serial_number}] PRINT START detected - file: {current_file}, "
                 f"subtask: {self.state.subtask_name}, is_new: {is_new_print}, is_file_change: {is_file_change}"
@@ -365,7 +463,6 @@ class BambuMQTTClient:
         should_trigger_completion = (
             self.state.state in ("FINISH", "FAILED")
             and not self._completion_triggered
-            and self.on_print_complete
             and (
                 self._previous_gcode_state == "RUNNING"  # Normal transition
                 or (self._was_running and self._previous_gcode_state != self.state.state)  # After server restart
@@ -376,7 +473,6 @@ class BambuMQTTClient:
             self.state.state == "IDLE"
             and self._previous_gcode_state == "RUNNING"
             and not self._completion_triggered
-            and self.on_print_complete
         ):
             should_trigger_completion = True
 
@@ -394,6 +490,7 @@ class BambuMQTTClient:
             )
             self._completion_triggered = True
             self._was_running = False
+            dirty = True
             self.on_print_complete({
                 "status": status,
                 "filename": self._previous_gcode_file or current_file,
@@ -405,14 +502,13 @@ class BambuMQTTClient:
         if current_file:
             self._previous_gcode_file = current_file
 
-        if self.on_state_change:
+        if dirty:
             self.on_state_change(self.state)
 
     def _request_push_all(self):
         """Request full status update from printer."""
         if self._client:
-            message = {"pushing": {"command": "pushall"}}
-            self._client.publish(self.topic_publish, json.dumps(message))
+            self._client.publish(self.topic_publish, _PUSHALL_COMMAND)
 
     def _prime_kprofile_request(self):
         """Send a priming K-profile request on connect.
@@ -431,16 +527,19 @@ class BambuMQTTClient:
                 }
             }
             logger.debug(f"[{self.serial_number}] Sending K-profile priming request")
-            self._client.publish(self.topic_publish, json.dumps(command))
+            self._client.publish(self.topic_publish, orjson.dumps(command))
 
     def connect(self, loop: asyncio.AbstractEventLoop | None = None):
         """Connect to the printer MQTT broker.
 
+        The client socket is driven by the asyncio event loop rather than a
+        paho network thread, so all client callbacks run on the event loop.
+
         Args:
-            loop: The asyncio event loop to use for thread-safe callbacks.
-                  If not provided, will try to get the running loop.
+            loop: The asyncio event loop to run the client on.
+                  If not provided, the running loop is used.
         """
-        self._loop = loop
+        self._loop = loop or asyncio.get_running_loop()
         self._client = mqtt.Client(
             callback_api_version=mqtt.CallbackAPIVersion.VERSION2,
             client_id=f"bambutrack_{self.serial_number}",
@@ -451,6 +550,10 @@ class BambuMQTTClient:
         self._client.on_connect = self._on_connect
         self._client.on_disconnect = self._on_disconnect
         self._client.on_message = self._on_message
+        self._client.on_socket_open = self._on_socket_open
+        self._client.on_socket_close = self._on_socket_close
+        self._client.on_socket_register_write = self._on_socket_register_write
+        self._client.on_socket_unregister_write = self._on_socket_unregister_write
 
         # TLS setup - Bambu uses self-signed certs
         ssl_context = ssl.create_default_context()
@@ -461,7 +564,77 @@ class BambuMQTTClient:
         # Use shorter keepalive (15s) for faster disconnect detection
         # Paho considers connection lost after 1.5x keepalive with no response
         self._client.connect_async(self.ip_address, self.MQTT_PORT, keepalive=15)
-        self._client.loop_start()
+        self._network_task = self._loop.create_task(self._run_network(self._client))
+
+    async def _run_network(self, client: mqtt.Client):
+        """Connect, service and re-establish the MQTT connection on the event loop.
+
+        Socket reads and writes are handled by the selector callbacks registered
+        in _on_socket_open/_on_socket_register_write; this task covers
+        (re)connecting with backoff and paho's keepalive/timeout handling.
+        """
+        delay = self.RECONNECT_MIN_DELAY
+        while self._client is client:
+            # TCP connect and TLS handshake block, so keep them off the event loop
+            self._connecting = True
+            try:
+                await asyncio.to_thread(client.reconnect)
+            except OSError as e:
+                logger.debug(f"[{self.serial_number}] MQTT connect failed: {e}")
+            else:
+                if self._client is not client:
+                    # disconnect() was called while we were connecting
+                    client.disconnect()
+                    return
+                self._connecting = False
+                while self._client is client and client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+                    if client.is_connected():
+                        delay = self.RECONNECT_MIN_DELAY
+                    await asyncio.sleep(1)
+            finally:
+                self._connecting = False
+
+            if self._client is not client:
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+
+    def _call_on_loop(self, callback, *args):
+        """Run callback on the client's event loop.
+
+        Socket callbacks fire on the event loop, except during reconnect(),
+        which runs in a worker thread.
+        """
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def _on_socket_open(self, client, userdata, sock):
+        self._call_on_loop(self._loop.add_reader, sock, self._read_socket, client, sock)
+
+    def _on_socket_close(self, client, userdata, sock):
+        # Called just before the socket is closed, so still on a valid fd
+        self._call_on_loop(self._loop.remove_reader, sock)
+        self._call_on_loop(self._loop.remove_writer, sock)
+
+    def _on_socket_register_write(self, client, userdata, sock):
+        self._call_on_loop(self._loop.add_writer, sock, client.loop_write)
+
+    def _on_socket_unregister_write(self, client, userdata, sock):
+        self._call_on_loop(self._loop.remove_writer, sock)
+
+    @staticmethod
+    def _read_socket(client: mqtt.Client, sock):
+        client.loop_read()
+        # TLS may already hold further decrypted records, which won't make
+        # the socket readable again
+        while client.socket() is sock and sock.pending():
+            client.loop_read()
 
     def start_print(self, filename: str, plate_id: int = 1):
         """Start a print job on the printer.
@@ -486,21 +659,16 @@ class BambuMQTTClient:
                     "use_ams": True,
                 }
             }
-            logger.info(f"[{self.serial_number}] Sending print command: {json.dumps(command)}")
-            self._client.publish(self.topic_publish, json.dumps(command))
+            command_json = orjson.dumps(command)
+            logger.info(f"[{self.serial_number}] Sending print command: {command_json.decode()}")
+            self._client.publish(self.topic_publish, command_json)
             return True
         return False
 
     def stop_print(self) -> bool:
         """Stop the current print job."""
         if self._client and self.state.connected:
-            command = {
-                "print": {
-                    "command": "stop",
-                    "sequence_id": "0"
-                }
-            }
-            self._client.publish(self.topic_publish, json.dumps(command))
+            self._client.publish(self.topic_publish, _STOP_PRINT_COMMAND)
             logger.info(f"[{self.serial_number}] Sent stop print command")
             return True
         return False
@@ -508,23 +676,24 @@ class BambuMQTTClient:
     def disconnect(self):
         """Disconnect from the printer."""
         if self._client:
-            self._client.loop_stop()
-            self._client.disconnect()
+            client = self._client
             self._client = None
+            # A reconnect() in progress can't be interrupted; _run_network
+            # closes that connection itself once it returns
+            if self._network_task and not self._connecting:
+                self._network_task.cancel()
+            self._network_task = None
+            client.disconnect()
             self.state.connected = False
 
     def send_command(self, command: dict):
         """Send a command to the printer."""
         if self._client and self.state.connected:
+            command_json = orjson.dumps(command)
             # Log outgoing message if logging is enabled
             if self._logging_enabled:
-                self._message_log.append(MQTTLogEntry(
-                    timestamp=datetime.now().isoformat(),
-                    topic=self.topic_publish,
-                    direction="out",
-                    payload=command,
-                ))
-            self._client.publish(self.topic_publish, json.dumps(command))
+                self._message_log.append((time.time_ns(), self.topic_publish, "out", command_json))
+            self._client.publish(self.topic_publish, command_json)
 
     def enable_logging(self, enabled: bool = True):
         """Enable or disable MQTT message logging."""
@@ -533,7 +702,15 @@ class BambuMQTTClient:
 
     def get_logs(self) -> list[MQTTLogEntry]:
         """Get all logged MQTT messages."""
-        return list(self._message_log)
+        return [
+            MQTTLogEntry(
+                timestamp=datetime.fromtimestamp(ts / 1e9).isoformat(),
+                topic=topic,
+                direction=direction,
+                payload=orjson.Fragment(raw),
+            )
+            for ts, topic, direction, raw in self._message_log
+        ]
 
     def clear_logs(self):
         """Clear the message log."""
@@ -578,14 +755,9 @@ class BambuMQTTClient:
         self.state.kprofiles = profiles
         self._kprofile_response_data = profiles
 
-        # Signal that we received the response
-        # Use thread-safe method since MQTT callbacks run in a different thread
+        # Signal that we received the response (MQTT callbacks run on the event loop)
         if self._pending_kprofile_response:
-            if self._loop and self._loop.is_running():
-                self._loop.call_soon_threadsafe(self._pending_kprofile_response.set)
-            else:
-                # Fallback for when loop is not available
-                self._pending_kprofile_response.set()
+            self._pending_kprofile_response.set()
 
         logger.info(f"[{self.serial_number}] Received {len(profiles)} K-profiles")
 
@@ -607,13 +779,6 @@ class BambuMQTTClient:
             logger.warning(f"[{self.serial_number}] Cannot get K-profiles: not connected")
             return []
 
-        # Capture current event loop for thread-safe callback
-        try:
-            self._loop = asyncio.get_running_loop()
-        except RuntimeError:
-            logger.warning(f"[{self.serial_number}] No running event loop")
-            return []
-
         for attempt in range(max_retries):
             # Set up response event for this attempt
             self._sequence_id += 1
@@ -631,7 +796,7 @@ class BambuMQTTClient:
             }
 
             logger.info(f"[{self.serial_number}] Requesting K-profiles for nozzle {nozzle_diameter} (attempt {attempt + 1}/{max_retries})")
-            self._client.publish(self.topic_publish, json.dumps(command))
+            self._client.publish(self.topic_publish, orjson.dumps(command))
 
             # Wait for response
             try:
@@ -769,9 +934,9 @@ class BambuMQTTClient:
                 }
             }
 
-        command_json = json.dumps(command)
+        command_json = orjson.dumps(command)
         logger.info(f"[{self.serial_number}] Setting K-profile: {name} = {k_value} (cali_idx={cali_idx}, new={slot_id==0}, dual={is_dual_nozzle})")
-        logger.info(f"[{self.serial_number}] K-profile SET command: {command_json}")
+        logger.info(f"[{self.serial_number}] K-profile SET command: {command_json.decode()}")
         # Use QoS 1 for reliable delivery (at least once)
         self._client.publish(self.topic_publish, command_json, qos=1)
         return True
@@ -834,9 +999,9 @@ class BambuMQTTClient:
                 }
             }
 
-        command_json = json.dumps(command)
+        command_json = orjson.dumps(command)
         logger.info(f"[{self.serial_number}] Deleting K-profile: cali_idx={cali_idx}, filament={filament_id}, dual={is_dual_nozzle}")
-        logger.info(f"[{self.serial_number}] K-profile DELETE command: {command_json}")
+        logger.info(f"[{self.serial_number}] K-profile DELETE command: {command_json.decode()}")
         # Use QoS 1 for reliable delivery (at least once)
         self._client.publish(self.topic_publish, command_json, qos=1)
         return True
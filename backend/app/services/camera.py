@@ -5,6 +5,7 @@ Captures images from the printer's RTSPS camera stream using ffmpeg.
 
 import asyncio
 import logging
+import re
 import subprocess
 from pathlib import Path
 from datetime import datetime
@@ -14,6 +15,19 @@ from backend.app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Socket I/O timeout for the RTSP connection, so a stalled stream fails
+# on its own instead of waiting for the capture timeout
+RTSP_SOCKET_TIMEOUT_US = 5_000_000
+
+# ffmpeg's name for the RTSP socket timeout option, detected on first use
+_rtsp_timeout_option: str | None = None
+
+# Video codec of each printer's camera stream: {(ip_address, model): codec_name}
+_camera_codecs: dict[tuple[str, str | None], str] = {}
+
+# Input video stream line in ffmpeg's log, e.g. "Stream #0:0: Video: h264 (High), ..."
+_VIDEO_STREAM_RE = re.compile(rb"Stream #0:\d+.*?: Video: (\w+)")
+
 
 def get_camera_port(model: str | None) -> int:
     """Get the RTSPS port based on printer model.
@@ -35,6 +49,86 @@ def build_camera_url(ip_address: str, access_code: str, model: str | None) -> st
     return f"rtsps://bblp:{access_code}@{ip_address}:{port}/streaming/live/1"
 
 
+async def _get_rtsp_timeout_option() -> str:
+    """Get the ffmpeg option for the RTSP socket I/O timeout.
+
+    ffmpeg 5 renamed -stimeout to -timeout, which older versions use for
+    listen mode instead, so check which one the installed ffmpeg supports.
+    """
+    global _rtsp_timeout_option
+    if _rtsp_timeout_option is None:
+        option = "-timeout"
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-hide_banner", "-h", "demuxer=rtsp",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            stdout, _ = await process.communicate()
+            if b"-stimeout" in stdout:
+                option = "-stimeout"
+        except FileNotFoundError:
+            pass
+        _rtsp_timeout_option = option
+    return _rtsp_timeout_option
+
+
+async def _rtsp_input_args(camera_url: str) -> list[str]:
+    """ffmpeg input arguments for reading the printer's RTSPS stream."""
+    # -rtsp_transport tcp: Use TCP for RTSP (more reliable)
+    return [
+        "-rtsp_transport", "tcp",
+        await _get_rtsp_timeout_option(), str(RTSP_SOCKET_TIMEOUT_US),
+        "-i", camera_url,
+    ]
+
+
+async def _run_ffmpeg(args: list[str], timeout: int) -> bytes | None:
+    """Run ffmpeg with the given arguments, returning its log output if it succeeded."""
+    try:
+        # Run ffmpeg asynchronously with timeout
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", *args,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        try:
+            _, stderr = await asyncio.wait_for(
+                process.communicate(),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.error(f"Camera capture timed out after {timeout}s")
+            return None
+
+        if process.returncode != 0:
+            stderr_text = stderr.decode() if stderr else "Unknown error"
+            logger.error(f"ffmpeg failed with code {process.returncode}: {stderr_text}")
+            return None
+        return stderr
+
+    except FileNotFoundError:
+        logger.error("ffmpeg not found. Please install ffmpeg to enable camera capture.")
+        return None
+    except Exception as e:
+        logger.exception(f"Camera capture failed: {e}")
+        return None
+
+
+def _remember_camera_codec(codec_key: tuple[str, str | None], ffmpeg_log: bytes) -> None:
+    """Record the camera's video codec from the input section of an ffmpeg log."""
+    if codec_key in _camera_codecs:
+        return
+    match = _VIDEO_STREAM_RE.search(ffmpeg_log.split(b"Output #0", 1)[0])
+    if match:
+        codec = match.group(1).decode()
+        logger.info(f"Camera stream codec for {codec_key[0]}: {codec}")
+        _camera_codecs[codec_key] = codec
+
+
 async def capture_camera_frame(
     ip_address: str,
     access_code: str,
@@ -57,61 +151,40 @@ async def capture_camera_frame(
     camera_url = build_camera_url(ip_address, access_code, model)
 
     # Ensure output directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread(output_path.parent.mkdir, parents=True, exist_ok=True)
+
+    # MJPEG frames already are JPEG images, so copy them instead of re-encoding.
+    # The codec is learned from the log of an earlier capture; until then
+    # (or for other codecs) encode with -q:v 2: High quality JPEG (1-31, lower is better)
+    codec_key = (ip_address, model)
+    if _camera_codecs.get(codec_key) == "mjpeg":
+        codec_args = ["-c:v", "copy"]
+    else:
+        codec_args = ["-q:v", "2"]
 
     # ffmpeg command to capture a single frame from RTSPS stream
-    # -rtsp_transport tcp: Use TCP for RTSP (more reliable)
     # -y: Overwrite output file
     # -frames:v 1: Capture only 1 frame
-    # -q:v 2: High quality JPEG (1-31, lower is better)
-    cmd = [
-        "ffmpeg",
+    args = [
         "-y",  # Overwrite output
-        "-rtsp_transport", "tcp",
-        "-i", camera_url,
+        *await _rtsp_input_args(camera_url),
         "-frames:v", "1",
-        "-q:v", "2",
+        *codec_args,
         str(output_path),
     ]
 
     logger.info(f"Capturing camera frame from {ip_address} (model: {model})")
 
-    try:
-        # Run ffmpeg asynchronously with timeout
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-
-        try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout
-            )
-        except asyncio.TimeoutError:
-            process.kill()
-            await process.wait()
-            logger.error(f"Camera capture timed out after {timeout}s")
-            return False
-
-        if process.returncode != 0:
-            stderr_text = stderr.decode() if stderr else "Unknown error"
-            logger.error(f"ffmpeg failed with code {process.returncode}: {stderr_text}")
-            return False
-
-        if output_path.exists() and output_path.stat().st_size > 0:
-            logger.info(f"Successfully captured camera frame: {output_path}")
-            return True
-        else:
-            logger.error("Camera capture produced no output file")
-            return False
-
-    except FileNotFoundError:
-        logger.error("ffmpeg not found. Please install ffmpeg to enable camera capture.")
+    ffmpeg_log = await _run_ffmpeg(args, timeout)
+    if ffmpeg_log is None:
         return False
-    except Exception as e:
-        logger.exception(f"Camera capture failed: {e}")
+    _remember_camera_codec(codec_key, ffmpeg_log)
+
+    if output_path.exists() and output_path.stat().st_size > 0:
+        logger.info(f"Successfully captured camera frame: {output_path}")
+        return True
+    else:
+        logger.error("Camera capture produced no output file")
         return False
 
 
@@ -136,7 +209,7 @@ async def capture_finish_photo(
     """
     # Create photos subdirectory
     photos_dir = archive_dir / "photos"
-    photos_dir.mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread(photos_dir.mkdir, parents=True, exist_ok=True)
 
     # Generate filename with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -168,25 +241,18 @@ async def test_camera_connection(
 
     Returns dict with success status and any error message.
     """
-    import tempfile
-
-    with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as f:
-        test_path = Path(f.name)
+    camera_url = build_camera_url(ip_address, access_code, model)
 
-    try:
-        success = await capture_camera_frame(
-            ip_address=ip_address,
-            access_code=access_code,
-            model=model,
-            output_path=test_path,
-            timeout=15,
-        )
+    # Read one frame and discard it (null muxer): no JPEG encode or temp file
+    args = [
+        *await _rtsp_input_args(camera_url),
+        "-frames:v", "1",
+        "-f", "null", "-",
+    ]
 
-        if success:
-            return {"success": True, "message": "Camera connection successful"}
-        else:
-            return {"success": False, "error": "Failed to capture frame from camera"}
-    finally:
-        # Clean up test file
-        if test_path.exists():
-            test_path.unlink()
+    ffmpeg_log = await _run_ffmpeg(args, timeout=15)
+    if ffmpeg_log is not None:
+        _remember_camera_codec((ip_address, model), ffmpeg_log)
+        return {"success": True, "message": "Camera connection successful"}
+    else:
+        return {"success": False, "error": "Failed to capture frame from camera"}
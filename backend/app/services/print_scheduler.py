@@ -153,8 +153,7 @@ class PrintScheduler:
             logger.info(f"Powered on smart plug '{plug.name}' for printer {printer_id}")
 
         # Get printer from database for connection
-        result = await db.execute(select(Printer).where(Printer.id == printer_id))
-        printer = result.scalar_one_or_none()
+        printer = await db.get(Printer, printer_id)
         if not printer:
             logger.error(f"Printer {printer_id} not found in database")
             return False
@@ -236,10 +235,7 @@ class PrintScheduler:
             return
 
         # Get printer
-        result = await db.execute(
-            select(Printer).where(Printer.id == item.printer_id)
-        )
-        printer = result.scalar_one_or_none()
+        printer = await db.get(Printer, item.printer_id)
         if not printer:
             item.status = "failed"
             item.error_message = "Printer not found"
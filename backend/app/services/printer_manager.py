@@ -44,7 +44,16 @@ class PrinterManager:
     def _schedule_async(self, coro):
         """Schedule an async coroutine from a sync context."""
         if self._loop and self._loop.is_running():
-            asyncio.run_coroutine_threadsafe(coro, self._loop)
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+            # MQTT callbacks already run on the event loop; other threads
+            # have to go through the thread-safe path
+            if running_loop is self._loop:
+                self._loop.create_task(coro)
+            else:
+                asyncio.run_coroutine_threadsafe(coro, self._loop)
 
     async def connect_printer(self, printer: Printer) -> bool:
         """Connect to a printer."""
@@ -96,9 +105,9 @@ class PrinterManager:
 
     def disconnect_printer(self, printer_id: int):
         """Disconnect from a printer."""
-        if printer_id in self._clients:
-            self._clients[printer_id].disconnect()
-            del self._clients[printer_id]
+        client = self._clients.pop(printer_id, None)
+        if client:
+            client.disconnect()
 
     def disconnect_all(self):
         """Disconnect from all printers."""
@@ -269,7 +278,8 @@ def printer_state_to_dict(state: PrinterState, printer_id: int | None = None) ->
         "remaining_time": state.remaining_time,
         "layer_num": state.layer_num,
         "total_layers": state.total_layers,
-        "temperatures": state.temperatures,
+        # Copy, since the MQTT client updates the temperatures dict in place
+        "temperatures": dict(state.temperatures),
         "hms_errors": [
             {"code": e.code, "module": e.module, "severity": e.severity}
             for e in (state.hms_errors or [])
@@ -0,0 +1,4 @@
+import os
+
+# Keep test runs from writing log files into the working tree
+os.environ.setdefault("LOG_TO_FILE", "false")
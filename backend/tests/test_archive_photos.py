@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.app.core.database import Base
+from backend.app.models.archive import PrintArchive
+from backend.app.services.archive import ArchiveService
+
+
+async def _append_photo(initial_photos_sql: str) -> list | None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                text(
+                    "INSERT INTO print_archives (id, filename, file_path, file_size, status, is_favorite, photos) "
+                    f"VALUES (1, 'a.3mf', 'archive/a.3mf', 1, 'completed', 0, {initial_photos_sql})"
+                )
+            )
+            await conn.execute(
+                update(PrintArchive)
+                .where(PrintArchive.id == 1)
+                .values(photos=ArchiveService.append_photo_expr("finish.jpg"))
+            )
+            result = await conn.execute(select(PrintArchive.photos).where(PrintArchive.id == 1))
+            return result.scalar_one()
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("initial", ["NULL", "'null'"])
+async def test_append_photo_to_empty_photos(initial):
+    assert await _append_photo(initial) == ["finish.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_append_photo_keeps_existing_photos():
+    assert await _append_photo("'[\"before.jpg\"]'") == ["before.jpg", "finish.jpg"]
@@ -0,0 +1,57 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app import main
+from backend.app.api.routes import websocket
+from backend.app.services.bambu_mqtt import PrinterState
+from backend.app.services.printer_manager import printer_state_to_dict
+
+
+def _running_state(progress: float) -> PrinterState:
+    return PrinterState(
+        connected=True,
+        state="RUNNING",
+        subtask_name="job",
+        gcode_file="/data/Metadata/plate_1.gcode",
+        progress=progress,
+        temperatures={"nozzle": 220.0, "bed": 60.0},
+    )
+
+
+def _ws_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(websocket.router)
+    return app
+
+
+def test_snapshot_then_diff_rebuilds_full_status(monkeypatch):
+    printer_id = 1
+    sent = []
+
+    async def capture(pid, data):
+        sent.append((pid, data))
+
+    monkeypatch.setattr(main.ws_manager, "send_printer_status", capture)
+    monkeypatch.setattr(main, "_last_status_broadcast", {})
+    monkeypatch.setattr(main, "_last_status_sent", {})
+
+    # A broadcast before the client connects primes the diff baseline
+    first = _running_state(10.0)
+    with TestClient(_ws_app()) as client:
+        client.portal.call(main.on_printer_status_change, printer_id, first)
+        monkeypatch.setattr(
+            websocket.printer_manager, "get_all_statuses", lambda: {printer_id: first}
+        )
+        with client.websocket_connect("/ws") as ws:
+            snapshot = ws.receive_json()
+
+        second = _running_state(20.0)
+        client.portal.call(main.on_printer_status_change, printer_id, second)
+
+    assert snapshot["printer_id"] == printer_id
+    assert snapshot["data"] == printer_state_to_dict(first, printer_id)
+
+    pid, diff = sent[-1]
+    assert pid == printer_id
+    assert diff == {"progress": 20.0}
+    assert {**snapshot["data"], **diff} == printer_state_to_dict(second, printer_id)